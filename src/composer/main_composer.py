@@ -3,7 +3,7 @@ import json
 from typing import Dict, Any
 from datetime import datetime
 from ..config.config_manager import ConfigManager
-from ..indicators.timeframe_manager import TimeframeManager
+from ..indicators.timeframe_manager import DEFAULT_CACHE_DIR, TimeframeManager
 from ..data_adapters.real_market_adapter import RealMarketAdapter
 from .bottom_composer import BottomComposer
 from .top_composer import TopComposer
@@ -15,7 +15,7 @@ class MainComposer:
 
         # Initialize data adapters
         self.market_adapter = RealMarketAdapter(config_manager)
-        self.tf_manager = TimeframeManager(config_manager, self.market_adapter)
+        self.tf_manager = TimeframeManager(config_manager, self.market_adapter, cache_dir=DEFAULT_CACHE_DIR)
 
         # Initialize composers
         self.bottom_composer = BottomComposer(config_manager, self.tf_manager)
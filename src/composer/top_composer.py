@@ -1,11 +1,16 @@
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from ..config.config_manager import ConfigManager
 from ..indicators.timeframe_manager import TimeframeManager
 from ..indicators.top import *
 
 class TopComposer:
+    # Indicators share a few rate-limited scrapers and some fan out further internally,
+    # so a small pool overlaps their I/O without a thread per indicator
+    MAX_WORKERS = 4
+
     def __init__(self, config_manager: ConfigManager, timeframe_manager: TimeframeManager):
         self.config = config_manager
         self.tf_manager = timeframe_manager
@@ -25,35 +30,44 @@ class TopComposer:
             PiCycleIndicator(config_manager, timeframe_manager)
         ]
 
-    def calculate_individual_scores(self) -> Dict[str, Any]:
-        """Calculate scores for all individual indicators"""
-        results = {}
+    def _calculate_indicator(self, indicator) -> Dict[str, Any]:
+        """Calculate one indicator's full result, recording failures instead of raising"""
+        indicator_name = indicator.get_indicator_name()
 
-        for indicator in self.indicators:
-            indicator_name = indicator.get_indicator_name()
+        try:
+            self.logger.info("Calculating %s...", indicator_name)
+            result = indicator.get_full_result()
 
-            try:
-                self.logger.info(f"Calculating {indicator_name}...")
-                result = indicator.get_full_result()
-                results[indicator_name] = result
+            if result['normalized_score'] is not None:
+                self.logger.info("%s: %.4f (weight: %s)", indicator_name, result['normalized_score'], result['weight'])
+            else:
+                self.logger.warning("%s: Failed to calculate", indicator_name)
 
-                if result['normalized_score'] is not None:
-                    self.logger.info(f"{indicator_name}: {result['normalized_score']:.4f} (weight: {result['weight']})")
-                else:
-                    self.logger.warning(f"{indicator_name}: Failed to calculate")
+            return result
 
-            except Exception as e:
-                self.logger.error(f"Error calculating {indicator_name}: {e}")
-                results[indicator_name] = {
-                    'name': indicator_name,
-                    'type': 'top',
-                    'raw_value': None,
-                    'normalized_score': None,
-                    'weight': indicator.get_weight(),
-                    'bounds': indicator.get_bounds(),
-                    'error': str(e),
-                    'timestamp': datetime.now()
-                }
+        except Exception as e:
+            self.logger.error("Error calculating %s: %s", indicator_name, e)
+            return {
+                'name': indicator_name,
+                'type': 'top',
+                'raw_value': None,
+                'normalized_score': None,
+                'weight': indicator.get_weight(),
+                'bounds': indicator.get_bounds(),
+                'error': str(e),
+                'timestamp': datetime.now()
+            }
+
+    def calculate_individual_scores(self) -> Dict[str, Any]:
+        """Calculate scores for all individual indicators"""
+        # Indicators are independent (scrapers wait on I/O, the rest share cached timeframe
+        # data), so they run concurrently; results keep the configured indicator order
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(self.indicators))) as executor:
+            futures = [executor.submit(self._calculate_indicator, indicator) for indicator in self.indicators]
+
+        results = {}
+        for indicator, future in zip(self.indicators, futures):
+            results[indicator.get_indicator_name()] = future.result()
 
         return results
 
@@ -173,7 +187,7 @@ class TopComposer:
                     }
                 }
 
-                self.logger.info(f"Top analysis complete - Score: {composite_result['composite_score']:.4f} ({interpretation['strength']})")
+                self.logger.info("Top analysis complete - Score: %.4f (%s)", composite_result['composite_score'], interpretation['strength'])
                 return complete_analysis
 
             else:
@@ -187,7 +201,7 @@ class TopComposer:
                 }
 
         except Exception as e:
-            self.logger.error(f"Error in complete top analysis: {e}")
+            self.logger.error("Error in complete top analysis: %s", e)
             return {
                 'type': 'top',
                 'error': str(e),
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# One lock per cache file, shared by every scraper instance that points at it
+_PATH_LOCKS: Dict[Path, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _path_lock(path: Path) -> threading.Lock:
+    """Lock guarding read-modify-write cycles on a cache file"""
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(path.resolve(), threading.Lock())
+
+
+class ValueCache:
+    """Scraped values keyed by URL, persisted as JSON so later runs within the TTL skip the request"""
+
+    def __init__(self, cache_dir: Optional[str], ttl_seconds: float, name: str):
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+        self._path = Path(cache_dir) / 'values.json' if cache_dir else None
+        self._lock = _path_lock(self._path) if self._path else None
+
+    def _read(self) -> Dict[str, Dict[str, float]]:
+        """Load cached values from disk"""
+        if not self._path.exists():
+            return {}
+        try:
+            with open(self._path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable {self.name} cache: {e}")
+            return {}
+
+    def get(self, url: str) -> Optional[float]:
+        """Return the cached value for url if it is younger than the TTL"""
+        if not self._path:
+            return None
+        with self._lock:
+            entry = self._read().get(url)
+        if entry and time.time() - entry['fetched_at'] < self.ttl_seconds:
+            return entry['value']
+        return None
+
+    def put(self, url: str, value: float):
+        """Persist a freshly scraped value for url"""
+        if not self._path:
+            return
+        with self._lock:
+            try:
+                cache = self._read()
+                cache[url] = {'value': value, 'fetched_at': time.time()}
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+
+                # Write to a sibling temp file and swap it in, so readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(cache, f)
+                    os.replace(tmp_path, self._path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except Exception as e:
+                self.logger.warning(f"Failed to write {self.name} cache: {e}")
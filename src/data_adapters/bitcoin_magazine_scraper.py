@@ -1,25 +1,52 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import threading
 import time
 import logging
 from typing import Optional, Dict
 from ..config.config_manager import ConfigManager
+from ._value_cache import ValueCache
 
 class BitcoinMagazineScraper:
-    def __init__(self, config_manager: ConfigManager):
+    # On-chain chart values update at most daily
+    CACHE_TTL_SECONDS = 86400
+
+    # Serializes rate-limited requests across every scraper instance
+    _request_lock = threading.Lock()
+
+    def __init__(self, config_manager: ConfigManager, cache_dir: Optional[str] = '.cache/btcmag'):
         self.config = config_manager
         self.session = requests.Session()
         self.base_config = self.config.get_data_source_config('bitcoin_magazine_pro')
         self.session.headers.update(self.base_config['headers'])
         self.logger = logging.getLogger(__name__)
 
+        self._value_cache = ValueCache(cache_dir, self.CACHE_TTL_SECONDS, 'Bitcoin Magazine')
+
+    def _get_metric(self, endpoint: str, chart_type: str) -> Optional[float]:
+        """Fetch and extract a chart value, served from the TTL cache when fresh"""
+        url = self.base_config['base_url'] + self.base_config['endpoints'][endpoint]
+        cached = self._value_cache.get(url)
+        if cached is not None:
+            self.logger.info(f"Using cached {chart_type} value: {cached}")
+            return cached
+
+        soup = self._make_request(url)
+        if soup:
+            value = self._extract_chart_value(soup, chart_type)
+            if value is not None:
+                self._value_cache.put(url, value)
+            return value
+        return None
+
     def _make_request(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
         for attempt in range(retries):
             try:
-                time.sleep(1)  # Rate limiting
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                with self._request_lock:
+                    time.sleep(1)  # Rate limiting
+                    response = self.session.get(url, timeout=30)
+                    response.raise_for_status()
                 return BeautifulSoup(response.content, 'html.parser')
             except Exception as e:
                 self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
@@ -123,31 +150,19 @@ class BitcoinMagazineScraper:
         return None
 
     def get_cvdd(self) -> Optional[float]:
-        url = self.base_config['base_url'] + self.base_config['endpoints']['cvdd']
-        soup = self._make_request(url)
-        if soup:
-            value = self._extract_chart_value(soup, 'cvdd')
-            self.logger.info(f"CVDD value: {value}")
-            return value
-        return None
+        value = self._get_metric('cvdd', 'cvdd')
+        self.logger.info(f"CVDD value: {value}")
+        return value
 
     def get_terminal_price(self) -> Optional[float]:
-        url = self.base_config['base_url'] + self.base_config['endpoints']['terminal_price']
-        soup = self._make_request(url)
-        if soup:
-            value = self._extract_chart_value(soup, 'terminal_price')
-            self.logger.info(f"Terminal Price value: {value}")
-            return value
-        return None
+        value = self._get_metric('terminal_price', 'terminal_price')
+        self.logger.info(f"Terminal Price value: {value}")
+        return value
 
     def get_nupl(self) -> Optional[float]:
-        url = self.base_config['base_url'] + self.base_config['endpoints']['nupl']
-        soup = self._make_request(url)
-        if soup:
-            value = self._extract_chart_value(soup, 'nupl')
-            self.logger.info(f"NUPL value: {value}")
-            return value
-        return None
+        value = self._get_metric('nupl', 'nupl')
+        self.logger.info(f"NUPL value: {value}")
+        return value
 
     def get_all_metrics(self) -> Dict[str, Optional[float]]:
         return {
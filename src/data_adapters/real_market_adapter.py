@@ -1,5 +1,7 @@
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import threading
 import time
 import logging
 import os
@@ -17,6 +19,8 @@ class RealMarketAdapter:
     def __init__(self, config_manager: ConfigManager):
         self.config = config_manager
         self.session = requests.Session()
+        # Keep-alive pool sized for concurrent timeframe refreshes
+        self.session.mount('https://', HTTPAdapter(pool_connections=5, pool_maxsize=5))
         self.logger = logging.getLogger(__name__)
 
         # API Keys from environment
@@ -29,6 +33,9 @@ class RealMarketAdapter:
         self.last_coingecko_call = 0
         self.alpha_vantage_delay = 12  # Alpha Vantage free tier: 5 calls/min
         self.coingecko_delay = 1  # CoinGecko Pro: higher limits
+        # One lock per provider: a long Alpha Vantage back-off must not stall CoinGecko callers
+        self._alpha_vantage_lock = threading.Lock()
+        self._coingecko_lock = threading.Lock()
 
         if not self.alpha_vantage_key:
             self.logger.warning("Alpha Vantage API key not found")
@@ -37,20 +44,23 @@ class RealMarketAdapter:
 
     def _rate_limit_alpha_vantage(self):
         """Ensure we don't exceed Alpha Vantage rate limits"""
-        elapsed = time.time() - self.last_alpha_vantage_call
-        if elapsed < self.alpha_vantage_delay:
-            sleep_time = self.alpha_vantage_delay - elapsed
-            self.logger.info(f"Rate limiting Alpha Vantage: sleeping {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-        self.last_alpha_vantage_call = time.time()
+        # Held while sleeping so concurrent callers are spaced out rather than bursting
+        with self._alpha_vantage_lock:
+            elapsed = time.time() - self.last_alpha_vantage_call
+            if elapsed < self.alpha_vantage_delay:
+                sleep_time = self.alpha_vantage_delay - elapsed
+                self.logger.info(f"Rate limiting Alpha Vantage: sleeping {sleep_time:.1f}s")
+                time.sleep(sleep_time)
+            self.last_alpha_vantage_call = time.time()
 
     def _rate_limit_coingecko(self):
         """Ensure we don't exceed CoinGecko rate limits"""
-        elapsed = time.time() - self.last_coingecko_call
-        if elapsed < self.coingecko_delay:
-            sleep_time = self.coingecko_delay - elapsed
-            time.sleep(sleep_time)
-        self.last_coingecko_call = time.time()
+        with self._coingecko_lock:
+            elapsed = time.time() - self.last_coingecko_call
+            if elapsed < self.coingecko_delay:
+                sleep_time = self.coingecko_delay - elapsed
+                time.sleep(sleep_time)
+            self.last_coingecko_call = time.time()
 
     def get_current_btc_price(self) -> Optional[float]:
         """Get current BTC price from multiple sources"""
@@ -128,6 +138,31 @@ class RealMarketAdapter:
             return None
 
     def get_btc_historical_data(self, timeframe: str, bars: int = 300) -> Optional[pd.DataFrame]:
+        """Get historical BTCUSD data; 3D and 5D bars are resampled from Alpha Vantage daily bars"""
+        days = self._DAILY_DERIVED_DAYS.get(timeframe)
+        if days is None:
+            return self._fetch_alpha_vantage_history(timeframe, bars)
+
+        daily = self._fetch_alpha_vantage_history('D', bars * days)
+        if daily is None:
+            return None
+        return self._resample_daily(daily, timeframe, bars)
+
+    # Timeframes built from daily bars, in days per bar; M and W use Alpha Vantage's own series
+    _DAILY_DERIVED_DAYS = {'D': 1, '3D': 3, '5D': 5}
+
+    @classmethod
+    def _resample_daily(cls, daily: pd.DataFrame, timeframe: str, bars: int) -> pd.DataFrame:
+        """Aggregate daily bars into epoch-aligned multi-day bars (the bucketing TimeframeManager uses)"""
+        days = cls._DAILY_DERIVED_DAYS[timeframe]
+        if days > 1:
+            # Hour-based rule: pandas ignores origin for day-based frequencies
+            daily = daily.resample(f'{days * 24}h', origin='epoch', label='left', closed='left').agg({
+                'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+            }).dropna(subset=['close'])
+        return daily.tail(bars)
+
+    def _fetch_alpha_vantage_history(self, timeframe: str, bars: int) -> Optional[pd.DataFrame]:
         """Get historical BTCUSD data from Alpha Vantage"""
         try:
             self._rate_limit_alpha_vantage()
@@ -371,6 +406,24 @@ class RealMarketAdapter:
         if df is None:
             return None
 
+        return self.build_timeframe_data(df, timeframe)
+
+    def get_timeframes_batch(self, timeframes: List[str], bars: int = 300) -> Dict[str, Any]:
+        """Get data for several timeframes, deriving D/3D/5D from a single daily fetch"""
+        derived = [tf for tf in timeframes if tf in self._DAILY_DERIVED_DAYS]
+        batch = {tf: self.get_timeframe_data(tf, bars) for tf in timeframes if tf not in derived}
+        if not derived:
+            return batch
+
+        daily = self._fetch_alpha_vantage_history('D', bars * max(self._DAILY_DERIVED_DAYS[tf] for tf in derived))
+        if daily is not None:
+            for tf in derived:
+                batch[tf] = self.build_timeframe_data(self._resample_daily(daily, tf, bars), tf)
+
+        return batch
+
+    def build_timeframe_data(self, df: pd.DataFrame, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Calculate technical indicators for an OHLCV frame"""
         try:
             # Calculate technical indicators
             indicators = {}
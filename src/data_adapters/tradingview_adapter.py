@@ -184,6 +184,12 @@ class TradingViewAdapter:
         if df is None:
             return None
 
+        return self.build_timeframe_data(df, timeframe)
+
+    def build_timeframe_data(self, df: pd.DataFrame, timeframe: str) -> Optional[Dict[str, Any]]:
+        """Calculate technical indicators for an OHLCV frame"""
+        symbol = self.tv_config['symbol']
+
         try:
             # Calculate technical indicators
             indicators = {}
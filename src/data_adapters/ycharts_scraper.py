@@ -1,25 +1,36 @@
 import requests
 from bs4 import BeautifulSoup
 import re
+import threading
 import time
 import logging
 from typing import Optional
 from ..config.config_manager import ConfigManager
+from ._value_cache import ValueCache
 
 class YChartsScraper:
-    def __init__(self, config_manager: ConfigManager):
+    # Average fee figures are refreshed by YCharts a few times a day at most
+    CACHE_TTL_SECONDS = 3600
+
+    # Serializes rate-limited requests across every scraper instance
+    _request_lock = threading.Lock()
+
+    def __init__(self, config_manager: ConfigManager, cache_dir: Optional[str] = '.cache/ycharts'):
         self.config = config_manager
         self.session = requests.Session()
         self.base_config = self.config.get_data_source_config('ycharts')
         self.session.headers.update(self.base_config['headers'])
         self.logger = logging.getLogger(__name__)
 
+        self._value_cache = ValueCache(cache_dir, self.CACHE_TTL_SECONDS, 'YCharts')
+
     def _make_request(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
         for attempt in range(retries):
             try:
-                time.sleep(2)  # Rate limiting for YCharts
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
+                with self._request_lock:
+                    time.sleep(2)  # Rate limiting for YCharts
+                    response = self.session.get(url, timeout=30)
+                    response.raise_for_status()
                 return BeautifulSoup(response.content, 'html.parser')
             except Exception as e:
                 self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
@@ -124,12 +135,19 @@ class YChartsScraper:
 
     def get_bitcoin_average_transaction_fee(self) -> Optional[float]:
         url = self.base_config['base_url'] + self.base_config['endpoints']['bitcoin_avg_tx_fee']
+        cached = self._value_cache.get(url)
+        if cached is not None:
+            self.logger.info(f"Using cached Bitcoin average transaction fee: ${cached}")
+            return cached
+
         self.logger.info(f"Fetching Bitcoin average transaction fee from: {url}")
 
         soup = self._make_request(url)
         if soup:
             value = self._extract_transaction_fee(soup)
             self.logger.info(f"Bitcoin average transaction fee: ${value}")
+            if value is not None:
+                self._value_cache.put(url, value)
             return value
         return None
 
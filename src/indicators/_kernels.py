@@ -0,0 +1,176 @@
+"""Numeric kernels shared by indicators; loops are compiled with numba when it is installed"""
+import numpy as np
+from scipy.signal import lfilter
+from ._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _rsi_snapshot(rsi: np.ndarray, period: int):
+    """
+    Stochastic RSI, span-9 RSI EMA and span-13/8 chained RSI EMA of an RSI tail in one pass.
+    EMAs use the adjust=True form (weighted sum over sum of weights) to match pandas.
+    Components without enough history (period / 10 / 20 values) are NaN.
+    """
+    n = rsi.shape[0]
+
+    stoch = np.nan
+    if n >= period:
+        rsi_min = rsi[n - period]
+        rsi_max = rsi_min
+        for i in range(n - period + 1, n):
+            if rsi[i] < rsi_min:
+                rsi_min = rsi[i]
+            if rsi[i] > rsi_max:
+                rsi_max = rsi[i]
+        if rsi_max == rsi_min:
+            stoch = 0.5
+        else:
+            stoch = (rsi[n - 1] - rsi_min) / (rsi_max - rsi_min)
+
+    decay9 = 1.0 - 2.0 / 10.0
+    decay13 = 1.0 - 2.0 / 14.0
+    decay8 = 1.0 - 2.0 / 9.0
+    num9 = den9 = num13 = den13 = num8 = den8 = 0.0
+    for i in range(n):
+        value = rsi[i]
+        num9 = value + decay9 * num9
+        den9 = 1.0 + decay9 * den9
+        num13 = value + decay13 * num13
+        den13 = 1.0 + decay13 * den13
+        num8 = num13 / den13 + decay8 * num8
+        den8 = 1.0 + decay8 * den8
+
+    ema9 = num9 / den9 if n >= 10 else np.nan
+    tdi = num8 / den8 if n >= 20 else np.nan
+    return stoch, ema9, tdi
+
+
+@njit(cache=True)
+def _wavetrend_tci_loop(ap: np.ndarray, channel_length: int, average_length: int) -> np.ndarray:
+    """
+    WaveTrend TCI series in one pass: ESA and D are span-`channel_length` EMAs of the price and
+    of its absolute deviation from ESA, CI = (ap - ESA) / (0.015 * D) with non-finite values
+    zeroed, and TCI is the span-`average_length` EMA of CI.
+    EMAs use the adjust=True form to match pandas `ewm(span).mean()` on NaN-free input.
+    """
+    n = ap.shape[0]
+    tci = np.empty(n)
+
+    decay_c = 1.0 - 2.0 / (channel_length + 1.0)
+    decay_a = 1.0 - 2.0 / (average_length + 1.0)
+    num_esa = num_d = num_tci = 0.0
+    den_c = den_a = 0.0
+    for i in range(n):
+        den_c = 1.0 + decay_c * den_c
+        num_esa = ap[i] + decay_c * num_esa
+        deviation = ap[i] - num_esa / den_c
+
+        num_d = abs(deviation) + decay_c * num_d
+        d_ema = num_d / den_c
+        ci = deviation / (0.015 * d_ema) if d_ema != 0.0 else 0.0
+        if not np.isfinite(ci):
+            ci = 0.0
+
+        den_a = 1.0 + decay_a * den_a
+        num_tci = ci + decay_a * num_tci
+        tci[i] = num_tci / den_a
+    return tci
+
+
+def ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponentially weighted mean as a first-order IIR filter.
+    Matches pandas `Series.ewm(span=span).mean()` (adjust=True) on NaN-free input:
+    the weighted sum and the sum of weights are filtered separately and divided.
+    """
+    alpha = 2.0 / (span + 1.0)
+    denominator = [1.0, alpha - 1.0]
+    weighted_sum = lfilter([1.0], denominator, values)
+    weight_total = lfilter([1.0], denominator, np.ones_like(values))
+    return weighted_sum / weight_total
+
+
+def tail_finite(values: np.ndarray, n: int) -> np.ndarray:
+    """Finite values among the last n entries (the numpy analogue of `iloc[-n:].dropna()`)"""
+    tail = values[-n:]
+    return tail[np.isfinite(tail)]
+
+
+@njit(cache=True)
+def rsi_like(changes: np.ndarray) -> float:
+    """RSI-style strength (0-100) of a window of simple returns"""
+    # Clipped sums instead of masked selections; fmax/fmin drop NaN returns like the masks did
+    gains = np.fmax(changes, 0.0).sum()
+    losses = -np.fmin(changes, 0.0).sum()
+
+    if losses == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + gains / losses)
+
+
+@njit(cache=True)
+def slope1(values: np.ndarray) -> float:
+    """
+    Least-squares slope of values against x = 0..n-1 (same as `np.polyfit(range(n), values, 1)[0]`).
+    Uses the closed form with centred x, whose sum of squares is n(n^2 - 1) / 12.
+    """
+    n = values.shape[0]
+    center = (n - 1) / 2.0
+    total = 0.0
+    for i in range(n):
+        total += (i - center) * values[i]
+    return total * 12.0 / (n * (n * n - 1))
+
+
+@njit(cache=True)
+def zscore_last(values: np.ndarray) -> float:
+    """Z-score of the last value against the window (sample std); NaN if the window has no spread"""
+    n = values.shape[0]
+    mean = 0.0
+    for i in range(n):
+        mean += values[i]
+    mean /= n
+
+    sum_sq = 0.0
+    for i in range(n):
+        sum_sq += (values[i] - mean) ** 2
+    std = np.sqrt(sum_sq / (n - 1))
+
+    if not std > 0:
+        return np.nan
+    return (values[n - 1] - mean) / std
+
+
+@njit(cache=True)
+def crossover_scan(signal: np.ndarray, resistance: np.ndarray, lookback: int):
+    """
+    Bars since the latest upward crossover of signal over resistance (inf if none) and its
+    recency weight max(0, (lookback - bars_ago) / lookback). NaN values never cross.
+    """
+    n = signal.shape[0]
+    for k in range(n - 2, -1, -1):
+        if signal[k] <= resistance[k] and signal[k + 1] > resistance[k + 1]:
+            days_ago = n - 1 - k
+            return float(days_ago), max(0.0, (lookback - days_ago) / lookback)
+    return np.inf, 0.0
+
+
+def _wavetrend_tci_filtered(ap: np.ndarray, channel_length: int, average_length: int) -> np.ndarray:
+    """WaveTrend TCI series from three vectorised EWM filters (same result as the fused loop)"""
+    esa = ewm_mean(ap, channel_length)
+    deviation = ap - esa
+    d_ema = ewm_mean(np.abs(deviation), channel_length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ci = deviation / (0.015 * d_ema)
+    ci[~np.isfinite(ci)] = 0.0
+    return ewm_mean(ci, average_length)
+
+
+def wavetrend_tci(ap: np.ndarray, channel_length: int, average_length: int) -> np.ndarray:
+    """
+    WaveTrend TCI series. The fused loop wins once compiled; interpreted, the per-bar Python
+    loop is slower than three lfilter passes, so those are used when numba is not installed.
+    """
+    if NUMBA_AVAILABLE:
+        return _wavetrend_tci_loop(ap, channel_length, average_length)
+    return _wavetrend_tci_filtered(ap, channel_length, average_length)
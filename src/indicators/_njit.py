@@ -0,0 +1,14 @@
+"""Optional numba JIT: `njit` compiles with numba when it is installed and is a no-op otherwise"""
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
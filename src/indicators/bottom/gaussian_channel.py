@@ -63,7 +63,7 @@ class GaussianChannelIndicator(BaseIndicator):
                 return None
 
             # Current price position relative to channel
-            current_price = prices.iloc[-1]
+            current_price = daily_data['last_close']
             current_gma = gma.iloc[-1]
             current_std = gaussian_std.iloc[-1]
 
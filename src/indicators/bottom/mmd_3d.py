@@ -21,7 +21,7 @@ class MMD3DIndicator(BaseIndicator):
                 return None
 
             # Calculate momentum (rate of change)
-            current_price = prices.iloc[-1]
+            current_price = data['last_close']
             past_price = prices.iloc[-(periods + 1)]
             momentum = (current_price - past_price) / past_price * 100
 
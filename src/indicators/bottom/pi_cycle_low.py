@@ -56,7 +56,7 @@ class PiCycleLowIndicator(BaseIndicator):
 
             current_pi_line = pi_cycle_line.iloc[-1]
             current_support = support_line.iloc[-1]
-            current_price = prices.iloc[-1]
+            current_price = daily_data['last_close']
 
             # Look for crossover signals in recent periods
             lookback = 20
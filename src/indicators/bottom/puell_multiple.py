@@ -45,7 +45,7 @@ class PuellMultipleIndicator(BaseIndicator):
             current_block_reward = 6.25  # As of 2024 (halves every ~4 years)
 
             # Calculate daily issuance value proxy
-            current_price = prices.iloc[-1]
+            current_price = daily_data['last_close']
             daily_issuance_value = blocks_per_day * current_block_reward * current_price
 
             # Calculate 365-day (or available) moving average of daily issuance values
@@ -66,7 +66,7 @@ class PuellMultipleIndicator(BaseIndicator):
             puell_multiple = daily_issuance_value / ma_365_issuance
 
             # Additional validation using volume as mining activity proxy
-            current_volume = volumes.iloc[-1]
+            current_volume = daily_data['last_volume']
             avg_volume = volumes.tail(ma_period).mean()
             volume_factor = current_volume / avg_volume if avg_volume > 0 else 1.0
 
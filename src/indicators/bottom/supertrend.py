@@ -29,7 +29,7 @@ class SuperTrendIndicator(BaseIndicator):
             supertrend_data = daily_data['indicators']
             supertrend_values = supertrend_data['supertrend']
             trend_direction = supertrend_data['trend']
-            current_price = daily_data['ohlcv']['close'].iloc[-1]
+            current_price = daily_data['last_close']
 
             if len(supertrend_values) < 10:
                 self.logger.error("Insufficient SuperTrend data")
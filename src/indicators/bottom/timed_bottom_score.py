@@ -40,13 +40,13 @@ class TimedBottomScoreIndicator(BaseIndicator):
             if not daily_data:
                 return None
 
-            prices = daily_data['ohlcv']['close']
-            if len(prices) < 30:
+            returns = daily_data['arr'].ret
+            if len(returns) < 30:
                 return None
 
             # Calculate recent volatility vs historical
-            recent_returns = prices.pct_change().tail(10).std()
-            historical_returns = prices.pct_change().tail(30).std()
+            recent_returns = np.nanstd(returns[-10:], ddof=1)
+            historical_returns = np.nanstd(returns[-30:], ddof=1)
 
             if historical_returns == 0:
                 return 0.5
@@ -105,8 +105,8 @@ class TimedBottomScoreIndicator(BaseIndicator):
                 return None
 
             # Use RSI as proxy for on-chain sentiment
-            if 'rsi' in daily_data['indicators']:
-                rsi = daily_data['indicators']['rsi'].iloc[-1]
+            rsi = daily_data.get('last_rsi')
+            if rsi is not None:
                 # Low RSI = oversold = good for bottom detection
                 if rsi <= 30:  # Oversold
                     onchain_score = 1.0
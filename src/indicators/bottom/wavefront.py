@@ -1,6 +1,16 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from math import tanh
 import numpy as np
 from ..base_indicator import BaseIndicator
+from .._kernels import _rsi_snapshot
+
+# RSI history fed to the oscillators. The tail covers 6 half-lives of the slowest
+# (span 13 -> 8) smoothing, so dropping older bars moves the smoothed RSI by far less
+# than 0.003 (i.e. below float noise after normalization to [0, 1])
+RSI_SNAPSHOT_TAIL = (13 + 8) * 6
+
+COMPONENT_ORDER = ('m_stochastic_rsi', 'm_snabbel_rsi_ema', '10d_macd', 'm_tdi_gm', 'm_accumulation_distribution')
 
 class WavefrontIndicator(BaseIndicator):
     def __init__(self, config_manager, timeframe_manager):
@@ -9,81 +19,51 @@ class WavefrontIndicator(BaseIndicator):
     def get_indicator_name(self) -> str:
         return 'w_wavefront'
 
-    def calculate_stochastic_rsi(self, timeframe: str, period: int = 14) -> Optional[float]:
-        """Calculate Stochastic RSI for given timeframe"""
+    def calculate_rsi_snapshot(self, timeframe: str, period: int = 14) -> Optional[Tuple[float, float, float]]:
+        """Calculate Stochastic RSI, Snabbel RSI EMA and TDI GM in a single pass over the RSI tail"""
         try:
             data = self.tf_manager.get_timeframe_data(timeframe)
             if not data or 'rsi' not in data['indicators']:
                 return None
 
-            rsi_values = data['indicators']['rsi'].dropna()
-            if len(rsi_values) < period:
-                return None
-
-            # Get recent RSI values
-            recent_rsi = rsi_values.tail(period)
-            current_rsi = rsi_values.iloc[-1]
-
-            # Calculate Stochastic of RSI
-            rsi_min = recent_rsi.min()
-            rsi_max = recent_rsi.max()
-
-            if rsi_max == rsi_min:
-                return 0.5  # Neutral
-
-            stoch_rsi = (current_rsi - rsi_min) / (rsi_max - rsi_min)
-            return stoch_rsi
+            cache = self.tf_manager.indicator_cache
+            rsi_values = cache.rsi_values(timeframe, data, max(RSI_SNAPSHOT_TAIL, period * 4))
+            return cache.get_or_compute(
+                timeframe, data, ('rsi_snapshot', period),
+                lambda: _rsi_snapshot(rsi_values, period)
+            )
 
         except Exception as e:
-            self.logger.error(f"Error calculating Stochastic RSI for {timeframe}: {e}")
+            self.logger.error(f"Error calculating RSI snapshot for {timeframe}: {e}")
             return None
 
-    def calculate_snabbel_rsi_ema(self, timeframe: str) -> Optional[float]:
-        """Calculate Snabbel RSI EMA (custom RSI with EMA smoothing)"""
-        try:
-            data = self.tf_manager.get_timeframe_data(timeframe)
-            if not data or 'rsi' not in data['indicators']:
-                return None
-
-            rsi_values = data['indicators']['rsi'].dropna()
-            if len(rsi_values) < 10:
-                return None
-
-            # Apply EMA smoothing to RSI
-            ema_smoothed = rsi_values.ewm(span=9).mean()
-            current_value = ema_smoothed.iloc[-1]
-
-            # Normalize to [0,1] range
-            normalized = current_value / 100.0
-            return normalized
-
-        except Exception as e:
-            self.logger.error(f"Error calculating Snabbel RSI EMA for {timeframe}: {e}")
+    def _snapshot_component(self, timeframe: str, index: int, scale: float, period: int = 14) -> Optional[float]:
+        """One component of the RSI snapshot, or None if it lacks history"""
+        snapshot = self.calculate_rsi_snapshot(timeframe, period)
+        if snapshot is None or np.isnan(snapshot[index]):
             return None
+        return snapshot[index] / scale
 
-    def calculate_tdi_gm(self, timeframe: str) -> Optional[float]:
-        """Calculate TDI (Traders Dynamic Index) Green Mean"""
-        try:
-            data = self.tf_manager.get_timeframe_data(timeframe)
-            if not data or 'rsi' not in data['indicators']:
-                return None
-
-            rsi_values = data['indicators']['rsi'].dropna()
-            if len(rsi_values) < 20:
-                return None
-
-            # TDI Green Mean is typically a smoothed RSI
-            # Using double smoothing: EMA of EMA
-            first_smooth = rsi_values.ewm(span=13).mean()
-            second_smooth = first_smooth.ewm(span=8).mean()
+    def calculate_stochastic_rsi(self, timeframe: str, period: int = 14) -> Optional[float]:
+        """Calculate Stochastic RSI for given timeframe"""
+        return self._snapshot_component(timeframe, 0, 1.0, period)
 
-            current_value = second_smooth.iloc[-1]
-            normalized = current_value / 100.0
-            return normalized
+    def calculate_snabbel_rsi_ema(self, timeframe: str) -> Optional[float]:
+        """Calculate Snabbel RSI EMA (custom RSI with EMA smoothing), normalized to [0,1]"""
+        return self._snapshot_component(timeframe, 1, 100.0)
 
-        except Exception as e:
-            self.logger.error(f"Error calculating TDI GM for {timeframe}: {e}")
-            return None
+    def calculate_tdi_gm(self, timeframe: str) -> Optional[float]:
+        """Calculate TDI (Traders Dynamic Index) Green Mean: RSI double-smoothed with EMA(13) then EMA(8)"""
+        return self._snapshot_component(timeframe, 2, 100.0)
+
+    @staticmethod
+    def _money_flow_volume(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """Money Flow Volume (CLV * volume) per bar"""
+        # Money Flow Multiplier; bars with no range contribute nothing
+        bar_range = high - low
+        has_range = bar_range > 0
+        clv = np.where(has_range, ((close - low) - (high - close)) / np.where(has_range, bar_range, 1.0), 0.0)
+        return clv * volume
 
     def calculate_accumulation_distribution(self, timeframe: str) -> Optional[float]:
         """Calculate Accumulation/Distribution Line"""
@@ -96,36 +76,55 @@ class WavefrontIndicator(BaseIndicator):
             if len(ohlcv) < 20:
                 return None
 
-            # A/D Line calculation
-            high = ohlcv['high']
-            low = ohlcv['low']
-            close = ohlcv['close']
-            volume = ohlcv['volume']
+            # Rate of change of the A/D line over the last 10 points. By telescoping,
+            # AD[-1] - AD[-10] is the sum of the last 9 money flow volumes, so only
+            # that window is computed per call
+            window = 9
+            columns = [ohlcv[c].to_numpy(dtype=np.float64, copy=False) for c in ('high', 'low', 'close', 'volume')]
+            recent_flow = np.nansum(self._money_flow_volume(*(col[-window:] for col in columns)))
 
-            # Money Flow Multiplier
-            clv = ((close - low) - (high - close)) / (high - low)
-            clv = clv.fillna(0)  # Handle division by zero
+            # AD[-10] is the cumulative flow before the window; it only changes when
+            # new bars arrive, so it is memoized per data version
+            past_ad = self.tf_manager.indicator_cache.get_or_compute(
+                timeframe, data, 'ad_line_prefix',
+                lambda: np.nansum(self._money_flow_volume(*(col[:-window] for col in columns)))
+            )
 
-            # Money Flow Volume
-            mfv = clv * volume
+            ad_change = recent_flow / abs(past_ad) if past_ad != 0 else 0
 
-            # Accumulation/Distribution Line
-            ad_line = mfv.cumsum()
+            # Normalize to roughly [-1, 1] range
+            normalized = tanh(ad_change / 10.0)  # Adjust scaling as needed
+            return (normalized + 1) / 2  # Convert to [0, 1]
 
-            # Get rate of change for recent period
-            if len(ad_line) >= 10:
-                current_ad = ad_line.iloc[-1]
-                past_ad = ad_line.iloc[-10]
-                ad_change = (current_ad - past_ad) / abs(past_ad) if past_ad != 0 else 0
+        except Exception as e:
+            self.logger.error(f"Error calculating A/D for {timeframe}: {e}")
+            return None
 
-                # Normalize to roughly [-1, 1] range
-                normalized = np.tanh(ad_change / 10.0)  # Adjust scaling as needed
-                return (normalized + 1) / 2  # Convert to [0, 1]
+    def calculate_macd_component(self) -> Optional[float]:
+        """Calculate 10D MACD component (daily MACD histogram normalized by its recent spread)"""
+        try:
+            daily_data = self.tf_manager.get_daily_data()
+            if not daily_data or 'macd' not in daily_data['indicators']:
+                return None
+
+            macd_hist = daily_data['indicators']['histogram']
+            if len(macd_hist) == 0:
+                return None
 
-            return 0.5
+            # Normalize MACD histogram
+            current_hist = macd_hist.iloc[-1]
+            running = daily_data.get('running') or {}
+            hist_std = running.get('hist_std20')
+            if hist_std is None:
+                hist_std = macd_hist.tail(20).std()
+            if not hist_std > 0:
+                return None
+
+            normalized_macd = tanh(current_hist / hist_std)
+            return (normalized_macd + 1) / 2
 
         except Exception as e:
-            self.logger.error(f"Error calculating A/D for {timeframe}: {e}")
+            self.logger.error(f"Error calculating 10D MACD: {e}")
             return None
 
     def calculate_raw_value(self) -> Optional[float]:
@@ -147,59 +146,42 @@ class WavefrontIndicator(BaseIndicator):
                 'm_accumulation_distribution': 0.2
             })
 
-            components = {}
-
-            # 1. Monthly Stochastic RSI
-            stoch_rsi = self.calculate_stochastic_rsi('M')
-            if stoch_rsi is not None:
-                components['m_stochastic_rsi'] = stoch_rsi
-
-            # 2. Monthly Snabbel RSI EMA
-            snabbel_rsi = self.calculate_snabbel_rsi_ema('M')
-            if snabbel_rsi is not None:
-                components['m_snabbel_rsi_ema'] = snabbel_rsi
-
-            # 3. 10D MACD (using daily data, 10-period MACD)
-            daily_data = self.tf_manager.get_daily_data()
-            if daily_data and 'macd' in daily_data['indicators']:
-                macd_hist = daily_data['indicators']['histogram']
-                if len(macd_hist) > 0:
-                    # Normalize MACD histogram
-                    current_hist = macd_hist.iloc[-1]
-                    recent_hist = macd_hist.tail(20)
-                    if len(recent_hist) > 0:
-                        hist_std = recent_hist.std()
-                        if hist_std > 0:
-                            normalized_macd = np.tanh(current_hist / hist_std)
-                            components['10d_macd'] = (normalized_macd + 1) / 2
-
-            # 4. Monthly TDI GM
-            tdi_gm = self.calculate_tdi_gm('M')
-            if tdi_gm is not None:
-                components['m_tdi_gm'] = tdi_gm
-
-            # 5. Monthly Accumulation/Distribution
-            ad_value = self.calculate_accumulation_distribution('M')
-            if ad_value is not None:
-                components['m_accumulation_distribution'] = ad_value
-
-            if not components:
+            # Components are independent once the monthly/daily data is cached; the three
+            # monthly RSI oscillators come from one fused snapshot
+            tasks = {
+                'm_rsi_snapshot': lambda: self.calculate_rsi_snapshot('M'),
+                '10d_macd': self.calculate_macd_component,
+                'm_accumulation_distribution': lambda: self.calculate_accumulation_distribution('M')
+            }
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = {name: executor.submit(task) for name, task in tasks.items()}
+                results = {name: future.result() for name, future in futures.items()}
+
+            snapshot = results.pop('m_rsi_snapshot')
+            if snapshot is not None:
+                stoch_rsi, snabbel_ema, tdi_gm = snapshot
+                results['m_stochastic_rsi'] = stoch_rsi
+                results['m_snabbel_rsi_ema'] = snabbel_ema / 100.0
+                results['m_tdi_gm'] = tdi_gm / 100.0
+
+            # Fixed-order value/weight arrays; missing components are NaN and masked out
+            values = np.array([
+                np.nan if results.get(name) is None else results[name] for name in COMPONENT_ORDER
+            ], dtype=np.float64)
+            weights = np.array([wavefront_weights.get(name, 0.2) for name in COMPONENT_ORDER], dtype=np.float64)
+            available = ~np.isnan(values)
+
+            if not available.any():
                 self.logger.error("No wavefront components calculated successfully")
                 return None
 
             # Calculate weighted average
-            total_weight = 0
-            weighted_sum = 0
-
-            for component, value in components.items():
-                weight = wavefront_weights.get(component, 0.2)
-                weighted_sum += value * weight
-                total_weight += weight
-
+            total_weight = weights[available].sum()
             if total_weight == 0:
                 return None
 
-            wavefront_score = weighted_sum / total_weight
+            wavefront_score = np.dot(values[available], weights[available]) / total_weight
+            components = {name: float(values[i]) for i, name in enumerate(COMPONENT_ORDER) if available[i]}
 
             self.logger.info(f"Wavefront components: {components}")
             self.logger.info(f"Wavefront score: {wavefront_score:.4f}")
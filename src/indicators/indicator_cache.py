@@ -0,0 +1,54 @@
+from typing import Dict, Any, Callable, Hashable, Tuple, Union
+import numpy as np
+import pandas as pd
+from ._kernels import ewm_mean, tail_finite
+
+class IndicatorCache:
+    """
+    Memoizes values derived from timeframe data within a run.
+    Entries are tagged with the data version (bar count, tail timestamp, tail close)
+    and recomputed as soon as new bars are appended or the open bar changes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Hashable], Tuple[Tuple, Any]] = {}
+
+    @staticmethod
+    def data_version(data: Dict[str, Any]) -> Tuple:
+        """Version token identifying the state of a timeframe's OHLCV history"""
+        ohlcv = data['ohlcv']
+        if len(ohlcv) == 0:
+            return (0, None, None)
+        return (len(ohlcv), ohlcv.index[-1], ohlcv['close'].iat[-1])
+
+    def get_or_compute(self, timeframe: str, data: Dict[str, Any], key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it if the data has moved on"""
+        version = self.data_version(data)
+        entry = self._entries.get((timeframe, key))
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = compute()
+        self._entries[(timeframe, key)] = (version, value)
+        return value
+
+    def rsi_values(self, timeframe: str, data: Dict[str, Any], tail: int) -> np.ndarray:
+        """Finite RSI values among the last `tail` bars, as a float64 array"""
+        def compute():
+            rsi = data.get('indicators_np', {}).get('rsi')
+            if rsi is None:
+                rsi = data['indicators']['rsi'].to_numpy(dtype=np.float64)
+            return tail_finite(rsi, tail)
+
+        return self.get_or_compute(timeframe, data, ('rsi_finite', tail), compute)
+
+    def ewm(self, timeframe: str, data: Dict[str, Any], name: Hashable, values: Union[pd.Series, np.ndarray], span: int) -> np.ndarray:
+        """EWM mean of a named derived series, as a float64 array"""
+        return self.get_or_compute(
+            timeframe, data, (name, 'ewm', span),
+            lambda: ewm_mean(np.asarray(values, dtype=np.float64), span)
+        )
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._entries.clear()
@@ -1,25 +1,132 @@
+import json
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import math
+import threading
+import time
+from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from ..data_adapters.real_market_adapter import RealMarketAdapter
 from ..config.config_manager import ConfigManager
+from .indicator_cache import IndicatorCache
+
+# Default on-disk cache location, anchored at the project root rather than the working directory
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / '.cache' / 'tf'
+
+@dataclass
+class OHLCVArrays:
+    """Contiguous float64 OHLCV columns, indexed like data['ohlcv']"""
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    # Simple close-to-close returns (pct_change), NaN on the first bar
+    ret: np.ndarray
+
+    @classmethod
+    def from_frame(cls, ohlcv: pd.DataFrame) -> 'OHLCVArrays':
+        """Build from an OHLCV DataFrame without copying float64 columns"""
+        columns = {
+            column: ohlcv[column].to_numpy(dtype=np.float64, copy=False)
+            for column in ('open', 'high', 'low', 'close', 'volume')
+        }
+        close = columns['close']
+        ret = np.empty_like(close)
+        if len(close) > 0:
+            ret[0] = np.nan
+            ret[1:] = np.diff(close) / close[:-1]
+        return cls(ret=ret, **columns)
 
 class TimeframeManager:
-    def __init__(self, config_manager: ConfigManager, market_adapter: RealMarketAdapter):
+    # Cache lifetime per timeframe; coarser bars change less often
+    _TTL_MINUTES = {'M': 60 * 24, 'W': 60 * 6, '5D': 60 * 4, '3D': 60 * 2, 'D': 60, 'H': 5}
+    _BAR_SECONDS = {'5D': 5 * 86400, '3D': 3 * 86400, 'D': 86400, 'H': 3600}
+
+    def __init__(self, config_manager: ConfigManager, market_adapter: RealMarketAdapter, cache_dir: Optional[Union[str, Path]] = None):
         self.config = config_manager
         self.market_adapter = market_adapter
         self.logger = logging.getLogger(__name__)
         self._data_cache = {}
+        # Cache ages are measured on the monotonic clock; wall-clock times are kept for reporting
         self._last_update = {}
-
-    def _is_cache_valid(self, timeframe: str, max_age_minutes: int = 60) -> bool:
-        """Check if cached data is still valid"""
-        if timeframe not in self._last_update:
+        self._last_update_wall = {}
+        self.indicator_cache = IndicatorCache()
+        # _lock guards cache writes; fetches are serialized per timeframe so different
+        # timeframes can refresh concurrently
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+
+        # Optional on-disk OHLCV cache (L2) behind the in-memory cache (L1)
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        if self._cache_dir:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_cache()
+
+    def _load_disk_cache(self):
+        """Populate the in-memory cache from OHLCV frames persisted by a previous run"""
+        for ohlcv_path in self._cache_dir.glob('*.csv'):
+            timeframe = ohlcv_path.stem
+            manifest_path = ohlcv_path.with_suffix('.json')
+            if not manifest_path.exists():
+                continue
+
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+                last_update = datetime.fromisoformat(manifest['last_update'])
+
+                # Plain CSV rather than pickle, so a planted cache file cannot execute code on load
+                ohlcv = pd.read_csv(ohlcv_path, index_col=0, parse_dates=True, float_precision='round_trip')
+                data = self.market_adapter.build_timeframe_data(ohlcv, timeframe)
+                if not data:
+                    continue
+
+                data['last_update'] = last_update
+                self._prepare_data(data)
+                self._data_cache[timeframe] = data
+                age_seconds = (datetime.now() - last_update).total_seconds()
+                self._last_update[timeframe] = time.monotonic() - age_seconds
+                self._last_update_wall[timeframe] = last_update
+                self.logger.info(f"Loaded {len(ohlcv)} cached {timeframe} bars from disk")
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable disk cache for {timeframe}: {e}")
+
+    def _save_disk_cache(self, timeframe: str, data: Dict[str, Any]):
+        """Persist OHLCV bars and a freshness manifest for the timeframe"""
+        try:
+            data['ohlcv'].to_csv(self._cache_dir / f"{timeframe}.csv")
+            with open(self._cache_dir / f"{timeframe}.json", 'w') as f:
+                json.dump({'last_update': self._last_update_wall[timeframe].isoformat()}, f)
+        except Exception as e:
+            self.logger.warning(f"Failed to write disk cache for {timeframe}: {e}")
+
+    @classmethod
+    def _bar_index(cls, timeframe: str, timestamp: float) -> Optional[int]:
+        """Index of the UTC bar containing a POSIX timestamp, or None for unknown timeframes"""
+        if timeframe == 'M':
+            utc = datetime.fromtimestamp(timestamp, timezone.utc)
+            return utc.year * 12 + utc.month
+        if timeframe == 'W':
+            # The epoch fell on a Thursday; shift so weeks start on Monday
+            return int((timestamp // 86400 + 3) // 7)
+        bar_seconds = cls._BAR_SECONDS.get(timeframe)
+        return int(timestamp // bar_seconds) if bar_seconds else None
+
+    def _is_cache_valid(self, timeframe: str, max_age_minutes: Optional[int] = None) -> bool:
+        """Check if cached data is still valid: within the timeframe's TTL and the same bar"""
+        if max_age_minutes is None:
+            max_age_minutes = self._TTL_MINUTES.get(timeframe, 60)
+        if (time.monotonic() - self._last_update.get(timeframe, -math.inf)) >= max_age_minutes * 60:
             return False
 
-        age = datetime.now() - self._last_update[timeframe]
-        return age.total_seconds() / 60 < max_age_minutes
+        # A new bar opening invalidates the cache even if the TTL has not elapsed
+        cached_bar = self._bar_index(timeframe, self._last_update_wall[timeframe].timestamp())
+        return cached_bar == self._bar_index(timeframe, time.time())
 
     def get_timeframe_data(self, timeframe: str, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """Get data for specific timeframe with caching"""
@@ -27,15 +134,77 @@ class TimeframeManager:
             self.logger.info(f"Using cached data for {timeframe}")
             return self._data_cache.get(timeframe)
 
-        self.logger.info(f"Fetching fresh data for {timeframe}")
-        data = self.market_adapter.get_timeframe_data(timeframe)
+        with self._fetch_lock(timeframe):
+            # Another thread may have refreshed the timeframe while we waited
+            if not force_refresh and self._is_cache_valid(timeframe):
+                return self._data_cache.get(timeframe)
 
-        if data:
-            self._data_cache[timeframe] = data
-            self._last_update[timeframe] = datetime.now()
-            return data
+            self.logger.info(f"Fetching fresh data for {timeframe}")
+            data = self.market_adapter.get_timeframe_data(timeframe)
 
-        return None
+            if data:
+                self._store_timeframe_data(timeframe, data)
+                return data
+
+            return None
+
+    def _fetch_lock(self, timeframe: str) -> threading.Lock:
+        """Lock serializing fetches of one timeframe"""
+        with self._lock:
+            return self._fetch_locks.setdefault(timeframe, threading.Lock())
+
+    def _store_timeframe_data(self, timeframe: str, data: Dict[str, Any]):
+        """Enrich freshly fetched data and record it in the memory (and disk) cache"""
+        self._prepare_data(data)
+        with self._lock:
+            # Monotonic stamp last: lock-free validity checks read it first
+            self._data_cache[timeframe] = data
+            self._last_update_wall[timeframe] = datetime.now()
+            self._last_update[timeframe] = time.monotonic()
+        if self._cache_dir:
+            self._save_disk_cache(timeframe, data)
+
+    def _prepare_data(self, data: Dict[str, Any]) -> None:
+        """Attach precomputed terminal values and numpy views so indicators skip pandas indexing"""
+        ohlcv = data['ohlcv']
+        data['arr'] = OHLCVArrays.from_frame(ohlcv)
+        data['indicators_np'] = {
+            name: series.to_numpy(copy=False)
+            for name, series in data['indicators'].items() if isinstance(series, pd.Series)
+        }
+
+        data['running'] = self._window_stats(data, window=20)
+
+        if len(ohlcv) > 0:
+            data['last_close'] = float(data['arr'].close[-1])
+            data['last_volume'] = float(data['arr'].volume[-1])
+        else:
+            data['last_close'] = None
+            data['last_volume'] = None
+
+        rsi = data['indicators_np'].get('rsi')
+        data['last_rsi'] = float(rsi[-1]) if rsi is not None and len(rsi) > 0 else None
+
+    @staticmethod
+    def _window_stats(data: Dict[str, Any], window: int) -> Dict[str, Optional[float]]:
+        """Trailing-window aggregates reused by indicators, computed once per refresh"""
+        closes = data['arr'].close
+        histogram = data['indicators_np'].get('histogram')
+        running = {'sma20': None, 'std20': None, 'hist_std20': None}
+
+        if len(closes) >= window:
+            recent_closes = closes[-window:]
+            running['sma20'] = float(recent_closes.mean())
+            running['std20'] = float(recent_closes.std(ddof=1))
+
+        if histogram is not None and len(histogram) > 0:
+            # Matches Series.tail(window).std(): NaNs skipped, ddof=1
+            recent_hist = histogram[-window:]
+            recent_hist = recent_hist[~np.isnan(recent_hist)]
+            if len(recent_hist) > 1:
+                running['hist_std20'] = float(recent_hist.std(ddof=1))
+
+        return running
 
     def get_monthly_data(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
         """Get monthly timeframe data"""
@@ -62,8 +231,22 @@ class TimeframeManager:
         timeframes = ['M', 'W', '5D', '3D', 'D']
         all_data = {}
 
+        # Adapters with a batch fetch refresh all stale timeframes together
+        fetch_batch = getattr(self.market_adapter, 'get_timeframes_batch', None)
+        stale = [tf for tf in timeframes if force_refresh or not self._is_cache_valid(tf)]
+        if fetch_batch is not None and len(stale) > 1:
+            self.logger.info(f"Fetching fresh data for {', '.join(stale)} in one batch")
+            for tf, data in fetch_batch(stale).items():
+                if data:
+                    self._store_timeframe_data(tf, data)
+            force_refresh = False
+
+        # Remaining fetches are I/O bound, so timeframes are refreshed concurrently
+        with ThreadPoolExecutor(max_workers=len(timeframes)) as executor:
+            futures = {tf: executor.submit(self.get_timeframe_data, tf, force_refresh) for tf in timeframes}
+
         for tf in timeframes:
-            data = self.get_timeframe_data(tf, force_refresh)
+            data = futures[tf].result()
             if data:
                 all_data[tf] = data
             else:
@@ -71,6 +254,17 @@ class TimeframeManager:
 
         return all_data
 
+    def get_close_array(self, timeframe: str) -> Optional[np.ndarray]:
+        """Closing prices as a float64 array, shared by all callers until the timeframe refreshes"""
+        data = self.get_timeframe_data(timeframe)
+        if not data:
+            return None
+
+        arr = data.get('arr')
+        if arr is None:
+            return data['ohlcv']['close'].to_numpy(dtype=np.float64)
+        return arr.close
+
     def extract_indicator_value(self, timeframe: str, indicator_name: str, lookback: int = 0) -> Optional[float]:
         """Extract specific indicator value from timeframe data"""
         data = self.get_timeframe_data(timeframe)
@@ -78,11 +272,9 @@ class TimeframeManager:
             return None
 
         try:
-            indicators = data['indicators']
-            if indicator_name in indicators:
-                series = indicators[indicator_name]
-                if isinstance(series, pd.Series) and len(series) > lookback:
-                    return float(series.iloc[-(lookback + 1)])
+            values = data['indicators_np'].get(indicator_name)
+            if values is not None and len(values) > lookback:
+                return values[-(lookback + 1)]
         except Exception as e:
             self.logger.error(f"Error extracting {indicator_name} from {timeframe}: {e}")
 
@@ -95,9 +287,9 @@ class TimeframeManager:
             return None
 
         try:
-            ohlcv = data['ohlcv']
-            if column in ohlcv.columns and len(ohlcv) > lookback:
-                return float(ohlcv[column].iloc[-(lookback + 1)])
+            values = getattr(data['arr'], column, None)
+            if values is not None and len(values) > lookback:
+                return values[-(lookback + 1)]
         except Exception as e:
             self.logger.error(f"Error extracting {column} from {timeframe}: {e}")
 
@@ -110,15 +302,17 @@ class TimeframeManager:
             return None
 
         try:
-            volume = data['ohlcv']['volume']
-            recent_volume = volume.tail(periods)
+            recent_volume = data['arr'].volume[-periods:]
+            current_volume = data['last_volume']
+            volume_mean = recent_volume.mean()
+            volume_std = recent_volume.std(ddof=1)
 
             return {
-                'current': float(volume.iloc[-1]),
-                'mean': float(recent_volume.mean()),
-                'std': float(recent_volume.std()),
-                'z_score': float((volume.iloc[-1] - recent_volume.mean()) / recent_volume.std()),
-                'percentile': float((volume.iloc[-1] > recent_volume).sum() / len(recent_volume) * 100)
+                'current': current_volume,
+                'mean': volume_mean,
+                'std': volume_std,
+                'z_score': (current_volume - volume_mean) / volume_std,
+                'percentile': (current_volume > recent_volume).sum() / len(recent_volume) * 100
             }
         except Exception as e:
             self.logger.error(f"Error calculating volume statistics for {timeframe}: {e}")
@@ -131,17 +325,17 @@ class TimeframeManager:
             return None
 
         try:
-            ohlcv = data['ohlcv']
-            recent_closes = ohlcv['close'].tail(periods)
-            current_price = float(ohlcv['close'].iloc[-1])
+            arr = data['arr']
+            recent_closes = arr.close[-periods:]
+            current_price = data['last_close']
 
             return {
                 'current': current_price,
-                'mean': float(recent_closes.mean()),
-                'std': float(recent_closes.std()),
-                'high': float(ohlcv['high'].tail(periods).max()),
-                'low': float(ohlcv['low'].tail(periods).min()),
-                'change_pct': float((current_price - recent_closes.iloc[0]) / recent_closes.iloc[0] * 100)
+                'mean': recent_closes.mean(),
+                'std': recent_closes.std(ddof=1),
+                'high': arr.high[-periods:].max(),
+                'low': arr.low[-periods:].min(),
+                'change_pct': (current_price - recent_closes[0]) / recent_closes[0] * 100
             }
         except Exception as e:
             self.logger.error(f"Error calculating price statistics for {timeframe}: {e}")
@@ -154,12 +348,12 @@ class TimeframeManager:
             return None
 
         try:
-            closes = data['ohlcv']['close']
+            closes = data['arr'].close
             if len(closes) > periods:
-                current = closes.iloc[-1]
-                past = closes.iloc[-(periods + 1)]
+                current = data['last_close']
+                past = closes[-(periods + 1)]
                 momentum = (current - past) / past * 100
-                return float(momentum)
+                return momentum
         except Exception as e:
             self.logger.error(f"Error calculating momentum for {timeframe}: {e}")
 
@@ -179,12 +373,13 @@ class TimeframeManager:
     def get_cache_status(self) -> Dict[str, Any]:
         """Get status of cached data"""
         status = {}
+        now = time.monotonic()
         for tf in ['M', 'W', '5D', '3D', 'D']:
             if tf in self._last_update:
-                age_minutes = (datetime.now() - self._last_update[tf]).total_seconds() / 60
+                age_minutes = (now - self._last_update[tf]) / 60
                 status[tf] = {
                     'cached': True,
-                    'last_update': self._last_update[tf],
+                    'last_update': self._last_update_wall[tf],
                     'age_minutes': age_minutes,
                     'valid': self._is_cache_valid(tf)
                 }
@@ -42,20 +42,32 @@ class BBWPIndicator(BaseIndicator):
                 self.logger.error("Insufficient data for meaningful BBWP calculation")
                 return None
 
-            # Get current BB width and historical widths
-            current_width = bb_width.iloc[-1]
-            historical_widths = bb_width.tail(lookback_period)
-
-            # Calculate percentile of current width relative to historical
-            percentile = (historical_widths < current_width).sum() / len(historical_widths) * 100
+            # Get current BB width and the sorted historical window (sorted once per data version)
+            widths = bb_width.to_numpy(dtype=np.float64)
+            current_width = float(widths[-1])
+            sorted_widths = self.tf_manager.indicator_cache.get_or_compute(
+                'D', daily_data, ('bb_width_sorted', lookback_period),
+                lambda: np.sort(widths[-lookback_period:])
+            )
+
+            # Calculate percentile of current width relative to historical: the insertion
+            # point counts widths strictly below the current one (NaNs sort last)
+            if np.isnan(current_width):
+                percentile = 0.0
+            else:
+                rank = np.searchsorted(sorted_widths, current_width, side='left')
+                percentile = rank * 100.0 / len(sorted_widths)
 
             # Additional context: trend analysis
-            prices = daily_data['ohlcv']['close']
+            arr = daily_data.get('arr')
+            prices = arr.close if arr is not None else daily_data['ohlcv']['close'].to_numpy(dtype=np.float64)
             if len(prices) >= 20:
                 # Check if we're in an uptrend (for top detection context)
-                sma_20 = prices.rolling(window=20).mean()
-                current_price = prices.iloc[-1]
-                current_sma = sma_20.iloc[-1]
+                current_price = prices[-1]
+                running = daily_data.get('running') or {}
+                current_sma = running.get('sma20')
+                if current_sma is None:
+                    current_sma = prices[-20:].mean()
 
                 trend_context = "uptrend" if current_price > current_sma else "downtrend"
 
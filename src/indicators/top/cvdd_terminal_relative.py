@@ -23,7 +23,8 @@ class CVDDTerminalRelativeIndicator(BaseIndicator):
                 self.logger.error("Failed to get current BTC price")
                 return None
 
-            # Get CVDD and Terminal Price from Bitcoin Magazine Pro
+            # Get CVDD and Terminal Price from Bitcoin Magazine Pro; fetched one after the other
+            # because both go through the scraper's single requests.Session
             cvdd = self.btc_mag_scraper.get_cvdd()
             terminal_price = self.btc_mag_scraper.get_terminal_price()
 
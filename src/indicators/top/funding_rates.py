@@ -1,14 +1,22 @@
 from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import time
+import numpy as np
 from ..base_indicator import BaseIndicator
 
 class FundingRatesIndicator(BaseIndicator):
+    _EXCHANGES = ('Binance', 'Bybit', 'OKEx')
+
     def __init__(self, config_manager, timeframe_manager):
         super().__init__(config_manager, timeframe_manager, 'top')
         self.funding_config = self.config.get_data_source_config('funding_rates')
 
+        # Shared keep-alive session; exchanges are queried concurrently
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=3, pool_maxsize=3))
+
     def get_indicator_name(self) -> str:
         return 'funding_rates'
 
@@ -16,7 +24,7 @@ class FundingRatesIndicator(BaseIndicator):
         """Get funding rate from Binance"""
         try:
             url = self.funding_config['binance']
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -33,7 +41,7 @@ class FundingRatesIndicator(BaseIndicator):
         """Get funding rate from Bybit"""
         try:
             url = self.funding_config['bybit']
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -52,7 +60,7 @@ class FundingRatesIndicator(BaseIndicator):
         """Get funding rate from OKEx"""
         try:
             url = self.funding_config['okex']
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -73,37 +81,40 @@ class FundingRatesIndicator(BaseIndicator):
         High positive funding rates indicate long bias and potential top risk
         """
         try:
-            funding_rates = []
-
-            # Get funding rates from multiple exchanges
-            exchanges = {
-                'Binance': self.get_binance_funding_rate,
-                'Bybit': self.get_bybit_funding_rate,
-                'OKEx': self.get_okex_funding_rate
-            }
-
-            for exchange_name, get_rate_func in exchanges.items():
-                rate = get_rate_func()
+            # Get funding rates from multiple exchanges, in _EXCHANGES order
+            fetchers = (
+                self.get_binance_funding_rate,
+                self.get_bybit_funding_rate,
+                self.get_okex_funding_rate
+            )
+
+            # Each exchange is a different host, so no shared rate limit applies
+            with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+                futures = [executor.submit(func) for func in fetchers]
+
+            # Missing exchanges stay NaN and drop out of the average
+            funding_rates = np.full(len(self._EXCHANGES), np.nan)
+            for i, (exchange_name, future) in enumerate(zip(self._EXCHANGES, futures)):
+                rate = future.result()
                 if rate is not None:
-                    funding_rates.append(rate)
+                    funding_rates[i] = rate
                     self.logger.info(f"{exchange_name} funding rate: {rate:.6f}%")
                 else:
                     self.logger.warning(f"Failed to get {exchange_name} funding rate")
 
-                time.sleep(0.5)  # Rate limiting
-
-            if not funding_rates:
+            valid_count = int(np.count_nonzero(~np.isnan(funding_rates)))
+            if valid_count == 0:
                 self.logger.error("Failed to get any funding rates")
                 return None
 
             # Calculate weighted average (equal weights for now)
-            avg_funding_rate = sum(funding_rates) / len(funding_rates)
+            avg_funding_rate = np.nanmean(funding_rates)
 
             # Convert to basis points for easier interpretation
             funding_rate_bps = avg_funding_rate * 10000  # Convert to basis points
 
             self.logger.info(f"Average funding rate: {avg_funding_rate:.6f}% ({funding_rate_bps:.2f} bps)")
-            self.logger.info(f"Number of exchanges: {len(funding_rates)}")
+            self.logger.info(f"Number of exchanges: {valid_count}")
 
             # Return as basis points (will be normalized using bounds: Lower=-50, Upper=150)
             return float(funding_rate_bps)
@@ -1,6 +1,14 @@
+import logging
 from typing import Optional
 import numpy as np
 from ..base_indicator import BaseIndicator
+from .._kernels import rsi_like, slope1
+
+# Top risk ladder: very weak momentum (<= -20) = 4.0, weak = 2.0 + |m| / 20,
+# moderate = 1.0 + (20 - m) / 40, strong (> 20) = 0.5
+MOMENTUM_BANDS = np.array([-20.0, 0.0, 20.0])
+TOP_SCORE_INTERCEPTS = np.array([4.0, 2.0, 1.5, 0.5])
+TOP_SCORE_SLOPES = np.array([0.0, -1.0 / 20, -1.0 / 40, 0.0])
 
 class MMDIndicator(BaseIndicator):
     def __init__(self, config_manager, timeframe_manager):
@@ -16,32 +24,25 @@ class MMDIndicator(BaseIndicator):
             if not data:
                 return None
 
-            prices = data['ohlcv']['close']
-            volumes = data['ohlcv']['volume']
+            prices = data['arr'].close
+            volumes = data['arr'].volume
 
             if len(prices) < periods + 5:
                 return None
 
             # Calculate price momentum
-            current_price = prices.iloc[-1]
-            past_price = prices.iloc[-(periods + 1)]
+            window = prices[-(periods + 1):]
+            current_price = window[-1]
+            past_price = window[0]
             price_momentum = (current_price - past_price) / past_price * 100
 
             # Calculate volume momentum
-            current_volume = volumes.iloc[-1]
-            avg_volume = volumes.tail(periods).mean()
+            current_volume = volumes[-1]
+            avg_volume = volumes[-periods:].mean()
             volume_momentum = (current_volume / avg_volume - 1) * 100 if avg_volume > 0 else 0
 
-            # Calculate momentum strength (RSI-like)
-            price_changes = prices.pct_change().tail(periods)
-            positive_changes = price_changes[price_changes > 0].sum()
-            negative_changes = abs(price_changes[price_changes < 0].sum())
-
-            if negative_changes == 0:
-                momentum_strength = 100
-            else:
-                rs = positive_changes / negative_changes
-                momentum_strength = 100 - (100 / (1 + rs))
+            # Calculate momentum strength (RSI-like) from the precomputed returns across the window
+            momentum_strength = rsi_like(data['arr'].ret[-periods:])
 
             # Combine metrics
             combined_momentum = (price_momentum * 0.5 +
@@ -70,7 +71,7 @@ class MMDIndicator(BaseIndicator):
                 momentum = self.calculate_momentum_breadth(tf, period)
                 if momentum is not None:
                     momentum_values.append(momentum)
-                    self.logger.info(f"{tf} momentum: {momentum:.4f}")
+                    self.logger.info("%s momentum: %.4f", tf, momentum)
 
             if not momentum_values:
                 self.logger.error("Failed to calculate momentum for any timeframe")
@@ -88,13 +89,12 @@ class MMDIndicator(BaseIndicator):
                 weighted_momentum = momentum_values[0]
 
             # Additional analysis: momentum divergence
-            daily_data = self.tf_manager.get_daily_data()
-            if daily_data:
-                prices = daily_data['ohlcv']['close']
+            prices = self.tf_manager.get_close_array('D')
+            if prices is not None:
                 if len(prices) >= 20:
                     # Check for momentum divergence
-                    recent_prices = prices.tail(10)
-                    price_trend = np.polyfit(range(len(recent_prices)), recent_prices, 1)[0]
+                    recent_prices = prices[-10:]
+                    price_trend = slope1(recent_prices)
 
                     # If price is rising but momentum is falling = bearish divergence
                     if price_trend > 0 and weighted_momentum < -5:
@@ -113,25 +113,22 @@ class MMDIndicator(BaseIndicator):
 
             # For top indicator: lower/negative momentum = higher top risk
             # Convert to top risk score (invert momentum)
-            if adjusted_momentum > 20:
-                top_score = 0.5  # Strong momentum = low top risk
-            elif adjusted_momentum > 0:
-                top_score = 1.0 + (20 - adjusted_momentum) / 40  # Moderate momentum
-            elif adjusted_momentum > -20:
-                top_score = 2.0 + abs(adjusted_momentum) / 20    # Weak momentum
-            else:
-                top_score = 4.0  # Very weak momentum = high top risk
+            # Piecewise-linear ladder over (-inf, -20], (-20, 0], (0, 20], (20, inf);
+            # NaN momentum falls into the lowest band
+            band = 0 if np.isnan(adjusted_momentum) else np.searchsorted(MOMENTUM_BANDS, adjusted_momentum)
+            top_score = TOP_SCORE_INTERCEPTS[band] + TOP_SCORE_SLOPES[band] * adjusted_momentum
 
             # Cap the score
             final_score = min(top_score, 5.0)
 
-            self.logger.info(f"MMD Analysis:")
-            self.logger.info(f"  Momentum values: {momentum_values}")
-            self.logger.info(f"  Weighted momentum: {weighted_momentum:.4f}")
-            if 'divergence_factor' in locals():
-                self.logger.info(f"  Divergence factor: {divergence_factor:.2f}")
-                self.logger.info(f"  Adjusted momentum: {adjusted_momentum:.4f}")
-            self.logger.info(f"  Final MMD score: {final_score:.4f}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("MMD Analysis:")
+                self.logger.info("  Momentum values: %s", momentum_values)
+                self.logger.info("  Weighted momentum: %.4f", weighted_momentum)
+                if 'divergence_factor' in locals():
+                    self.logger.info("  Divergence factor: %.2f", divergence_factor)
+                    self.logger.info("  Adjusted momentum: %.4f", adjusted_momentum)
+                self.logger.info("  Final MMD score: %.4f", final_score)
 
             return float(final_score)
 
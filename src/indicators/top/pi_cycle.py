@@ -1,7 +1,8 @@
+import logging
 from typing import Optional
 import numpy as np
-from datetime import datetime, timedelta
 from ..base_indicator import BaseIndicator
+from .._kernels import crossover_scan
 
 class PiCycleIndicator(BaseIndicator):
     def __init__(self, config_manager, timeframe_manager):
@@ -10,6 +11,19 @@ class PiCycleIndicator(BaseIndicator):
     def get_indicator_name(self) -> str:
         return 'pi_cycle'
 
+    @staticmethod
+    def _tail_moving_average(values: np.ndarray, window: int, count: int) -> np.ndarray:
+        """Last `count` values of the `window`-bar simple moving average (NaN where history is short)"""
+        count = min(count, len(values))
+        segment = values[-(window + count - 1):]
+        cumulative = np.concatenate(([0.0], np.cumsum(segment)))
+        sums = cumulative[window:] - cumulative[:-window]
+
+        averages = np.full(count, np.nan)
+        if sums.size > 0:
+            averages[-sums.size:] = sums / window
+        return averages
+
     def calculate_raw_value(self) -> Optional[float]:
         """
         Calculate Pi Cycle Top indicator
@@ -20,66 +34,46 @@ class PiCycleIndicator(BaseIndicator):
         - Indicates potential cycle top
         """
         try:
-            daily_data = self.tf_manager.get_daily_data()
-            if not daily_data:
+            closes = self.tf_manager.get_close_array('D')
+            if closes is None:
                 self.logger.error("Failed to get daily data")
                 return None
 
-            prices = daily_data['ohlcv']['close']
-
             # Pi Cycle Top parameters
             short_period = 111  # 111-day MA
             long_period = 350   # 350-day MA
             multiplier = 2.0    # Pi Cycle multiplier
 
-            if len(prices) < long_period:
-                self.logger.warning(f"Insufficient data for Pi Cycle Top (need {long_period}, have {len(prices)})")
+            if len(closes) < long_period:
+                self.logger.warning("Insufficient data for Pi Cycle Top (need %d, have %d)", long_period, len(closes))
                 # Use available data with warning
-                long_period = min(len(prices) - 1, long_period)
+                long_period = min(len(closes) - 1, long_period)
                 short_period = min(short_period, long_period // 2)
 
             if long_period < 100:  # Minimum reasonable period
                 self.logger.error("Insufficient data for meaningful Pi Cycle Top calculation")
                 return None
 
-            # Calculate moving averages
-            ma_111 = prices.rolling(window=short_period).mean()
-            ma_350 = prices.rolling(window=long_period).mean()
+            # Moving averages are only needed over the crossover lookback window
+            lookback = 30
+            ma_111 = self._tail_moving_average(closes, short_period, lookback)
+            ma_350 = self._tail_moving_average(closes, long_period, lookback)
 
-            if ma_111.isna().iloc[-1] or ma_350.isna().iloc[-1]:
+            if not (np.isfinite(ma_111[-1]) and np.isfinite(ma_350[-1])):
                 self.logger.error("MA calculation failed for Pi Cycle Top")
                 return None
 
             # Calculate Pi Cycle Top lines
-            signal_line = ma_111      # 111-day MA
-            resistance_line = ma_350 * multiplier  # 350-day MA * 2
+            signal = ma_111      # 111-day MA
+            resistance = ma_350 * multiplier  # 350-day MA * 2
 
-            current_signal = signal_line.iloc[-1]
-            current_resistance = resistance_line.iloc[-1]
-            current_price = prices.iloc[-1]
+            current_signal = signal[-1]
+            current_resistance = resistance[-1]
+            current_price = closes[-1]
 
-            # Look for crossover signals in recent periods
-            lookback = 30
-            recent_signal = signal_line.tail(lookback)
-            recent_resistance = resistance_line.tail(lookback)
-
-            # Find crossovers (signal line crossing above resistance = top signal)
-            crossover_score = 0.0
-            days_since_crossover = float('inf')
-
-            for i in range(1, len(recent_signal)):
-                prev_signal = recent_signal.iloc[i-1]
-                prev_resistance = recent_resistance.iloc[i-1]
-                curr_signal = recent_signal.iloc[i]
-                curr_resistance = recent_resistance.iloc[i]
-
-                # Bearish crossover (signal crosses above resistance = TOP signal)
-                if prev_signal <= prev_resistance and curr_signal > curr_resistance:
-                    days_ago = len(recent_signal) - i
-                    days_since_crossover = min(days_since_crossover, days_ago)
-                    # Weight recent crossovers higher
-                    weight = max(0, (lookback - days_ago) / lookback)
-                    crossover_score = max(crossover_score, weight * 1.0)
+            # Find the latest crossover (signal line crossing above resistance = top signal);
+            # recent crossovers are weighted higher
+            days_since_crossover, crossover_score = crossover_scan(signal, resistance, lookback)
 
             # Calculate distance metrics
             signal_resistance_ratio = current_signal / current_resistance
@@ -123,14 +117,16 @@ class PiCycleIndicator(BaseIndicator):
             # Ensure [0,1] range
             final_score = max(0, min(1, final_score))
 
-            self.logger.info(f"Pi Cycle Top calculation:")
-            self.logger.info(f"  Current price: ${current_price:.2f}")
-            self.logger.info(f"  Signal line (111MA): ${current_signal:.2f}")
-            self.logger.info(f"  Resistance (350MA*2): ${current_resistance:.2f}")
-            self.logger.info(f"  Signal/Resistance ratio: {signal_resistance_ratio:.4f}")
-            self.logger.info(f"  Days since crossover: {days_since_crossover}")
-            self.logger.info(f"  Components - Crossover: {crossover_component:.4f}, Position: {position_score:.4f}, Confirmation: {confirmation_score:.4f}")
-            self.logger.info(f"  Pi Cycle Top score: {final_score:.4f}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Pi Cycle Top calculation:")
+                self.logger.info("  Current price: $%.2f", current_price)
+                self.logger.info("  Signal line (111MA): $%.2f", current_signal)
+                self.logger.info("  Resistance (350MA*2): $%.2f", current_resistance)
+                self.logger.info("  Signal/Resistance ratio: %.4f", signal_resistance_ratio)
+                self.logger.info("  Days since crossover: %s", days_since_crossover)
+                self.logger.info("  Components - Crossover: %.4f, Position: %.4f, Confirmation: %.4f",
+                                 crossover_component, position_score, confirmation_score)
+                self.logger.info("  Pi Cycle Top score: %.4f", final_score)
 
             return float(final_score)
 
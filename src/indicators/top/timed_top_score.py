@@ -1,11 +1,27 @@
-from typing import Optional, Dict
+import logging
+from typing import Optional, Dict, Callable
 import numpy as np
-from datetime import datetime, time
+from datetime import datetime
 from ..base_indicator import BaseIndicator
+from .._kernels import slope1
+
+# RSI sentiment ladder: below neutral (< 50), above neutral, elevated (>= 60),
+# overbought (>= 70), extreme overbought (>= 80)
+SENTIMENT_RSI_LEVELS = np.array([50.0, 60.0, 70.0, 80.0])
+SENTIMENT_SCORES = (0.2, 0.4, 0.6, 0.8, 1.0)
+
+# Scheduled distribution times (08:00 and 20:00) in minutes since midnight
+SCHEDULED_MINUTES = np.array([8 * 60, 20 * 60])
+MINUTES_PER_DAY = 24 * 60
+
+# Component weights for top detection: distribution, momentum exhaustion, sentiment, volatility
+COMPONENT_WEIGHTS = np.array([0.3, 0.3, 0.25, 0.15])
 
 class TimedTopScoreIndicator(BaseIndicator):
-    def __init__(self, config_manager, timeframe_manager):
+    def __init__(self, config_manager, timeframe_manager, clock: Optional[Callable[[], datetime]] = None):
         super().__init__(config_manager, timeframe_manager, 'top')
+        # Wall clock used for time weighting; defaults to datetime.now
+        self.clock = clock
 
     def get_indicator_name(self) -> str:
         return 'm_timed_top_score'
@@ -18,23 +34,18 @@ class TimedTopScoreIndicator(BaseIndicator):
                 return None
 
             # Analyze price vs volume for distribution signs
-            ohlcv = monthly_data['ohlcv']
-            if len(ohlcv) < 10:
+            arr = monthly_data['arr']
+            if len(arr.close) < 10:
                 return None
 
-            prices = ohlcv['close']
-            volumes = ohlcv['volume']
-
             # Calculate recent price and volume trends
             recent_periods = 6
-            recent_prices = prices.tail(recent_periods)
-            recent_volumes = volumes.tail(recent_periods)
 
             # Price trend
-            price_trend = np.polyfit(range(len(recent_prices)), recent_prices, 1)[0]
+            price_trend = slope1(arr.close[-recent_periods:])
 
             # Volume trend
-            volume_trend = np.polyfit(range(len(recent_volumes)), recent_volumes, 1)[0]
+            volume_trend = slope1(arr.volume[-recent_periods:])
 
             # Distribution pattern: rising prices with declining volume
             if price_trend > 0 and volume_trend < 0:
@@ -92,7 +103,7 @@ class TimedTopScoreIndicator(BaseIndicator):
             total_score = sum(score for _, score, _ in scores)
             avg_score = total_score / len(scores)
 
-            self.logger.info(f"Momentum exhaustion - Daily: {momentum_daily}, Weekly: {momentum_weekly}")
+            self.logger.info("Momentum exhaustion - Daily: %s, Weekly: %s", momentum_daily, momentum_weekly)
 
             return avg_score
 
@@ -108,22 +119,12 @@ class TimedTopScoreIndicator(BaseIndicator):
                 return None
 
             # Use RSI as sentiment proxy
-            if 'rsi' in daily_data['indicators']:
-                rsi = daily_data['indicators']['rsi'].iloc[-1]
-
-                # High RSI indicates overbought/euphoric conditions
-                if rsi >= 80:  # Extreme overbought
-                    sentiment_score = 1.0
-                elif rsi >= 70:  # Overbought
-                    sentiment_score = 0.8
-                elif rsi >= 60:  # Elevated
-                    sentiment_score = 0.6
-                elif rsi >= 50:  # Above neutral
-                    sentiment_score = 0.4
-                else:  # Below neutral
-                    sentiment_score = 0.2
-
-                return sentiment_score
+            rsi = daily_data.get('last_rsi')
+            if rsi is not None:
+                # High RSI indicates overbought/euphoric conditions; NaN RSI reads as below neutral
+                if np.isnan(rsi):
+                    return SENTIMENT_SCORES[0]
+                return SENTIMENT_SCORES[np.searchsorted(SENTIMENT_RSI_LEVELS, rsi, side='right')]
 
             return 0.5  # Neutral if no RSI data
 
@@ -135,16 +136,13 @@ class TimedTopScoreIndicator(BaseIndicator):
         """Calculate volatility expansion component"""
         try:
             daily_data = self.tf_manager.get_daily_data()
-            if not daily_data:
+            if not daily_data or len(daily_data['arr'].close) < 30:
                 return None
 
-            prices = daily_data['ohlcv']['close']
-            if len(prices) < 30:
-                return None
-
-            # Calculate recent volatility expansion
-            recent_returns = prices.pct_change().tail(10).std()
-            historical_returns = prices.pct_change().tail(30).std()
+            # Calculate recent volatility expansion from the precomputed daily returns
+            returns = daily_data['arr'].ret
+            recent_returns = np.nanstd(returns[-10:], ddof=1)
+            historical_returns = np.nanstd(returns[-30:], ddof=1)
 
             if historical_returns == 0:
                 return 0.5
@@ -170,18 +168,12 @@ class TimedTopScoreIndicator(BaseIndicator):
     def calculate_time_weight(self) -> float:
         """Calculate time-based weight factor for top detection"""
         try:
-            current_time = datetime.now().time()
-            scheduled_times = [time(8, 0), time(20, 0)]  # 08:00 and 20:00
+            now = self.clock() if self.clock else datetime.now()
 
-            # Calculate proximity to scheduled times
-            current_minutes = current_time.hour * 60 + current_time.minute
-
-            min_distance = float('inf')
-            for sched_time in scheduled_times:
-                sched_minutes = sched_time.hour * 60 + sched_time.minute
-                distance = min(abs(current_minutes - sched_minutes),
-                             1440 - abs(current_minutes - sched_minutes))
-                min_distance = min(min_distance, distance)
+            # Calculate proximity to scheduled times, wrapping around midnight
+            current_minutes = now.hour * 60 + now.minute
+            diff = np.abs(current_minutes - SCHEDULED_MINUTES)
+            min_distance = int(np.minimum(diff, MINUTES_PER_DAY - diff).min())
 
             # For tops, we might want to emphasize certain times
             # Market opens and closes often see distribution activity
@@ -206,49 +198,34 @@ class TimedTopScoreIndicator(BaseIndicator):
             sentiment_score = self.calculate_sentiment_component()
             volatility_score = self.calculate_volatility_expansion_component()
 
-            # Component weights for top detection
-            weights = {
-                'distribution': 0.3,
-                'momentum_exhaustion': 0.3,
-                'sentiment': 0.25,
-                'volatility': 0.15
-            }
-
-            # Calculate weighted score
-            total_weight = 0
-            weighted_sum = 0
-
-            components = {
-                'distribution': distribution_score,
-                'momentum_exhaustion': momentum_score,
-                'sentiment': sentiment_score,
-                'volatility': volatility_score
-            }
-
-            for component, score in components.items():
-                if score is not None:
-                    weight = weights[component]
-                    weighted_sum += score * weight
-                    total_weight += weight
-
-            if total_weight == 0:
+            # Weighted mean over available components; missing ones are NaN and masked out
+            scores = np.array([
+                np.nan if score is None else score
+                for score in (distribution_score, momentum_score, sentiment_score, volatility_score)
+            ], dtype=np.float64)
+            available = ~np.isnan(scores)
+
+            if not available.any():
                 self.logger.error("No valid components for timed top score")
                 return None
 
-            base_score = weighted_sum / total_weight
+            base_score = np.dot(scores[available], COMPONENT_WEIGHTS[available]) / COMPONENT_WEIGHTS[available].sum()
 
             # Apply time weighting
             time_weight = self.calculate_time_weight()
             final_score = base_score * time_weight
 
-            self.logger.info(f"Timed Top Score components:")
-            self.logger.info(f"  Distribution: {distribution_score:.4f}" if distribution_score else "  Distribution: None")
-            self.logger.info(f"  Momentum exhaustion: {momentum_score:.4f}" if momentum_score else "  Momentum exhaustion: None")
-            self.logger.info(f"  Sentiment: {sentiment_score:.4f}" if sentiment_score else "  Sentiment: None")
-            self.logger.info(f"  Volatility: {volatility_score:.4f}" if volatility_score else "  Volatility: None")
-            self.logger.info(f"  Base score: {base_score:.4f}")
-            self.logger.info(f"  Time weight: {time_weight:.4f}")
-            self.logger.info(f"  Final timed top score: {final_score:.4f}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Timed Top Score components:")
+                for label, score in (('Distribution', distribution_score), ('Momentum exhaustion', momentum_score),
+                                     ('Sentiment', sentiment_score), ('Volatility', volatility_score)):
+                    if score:
+                        self.logger.info("  %s: %.4f", label, score)
+                    else:
+                        self.logger.info("  %s: None", label)
+                self.logger.info("  Base score: %.4f", base_score)
+                self.logger.info("  Time weight: %.4f", time_weight)
+                self.logger.info("  Final timed top score: %.4f", final_score)
 
             return float(final_score)
 
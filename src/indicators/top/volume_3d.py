@@ -1,14 +1,50 @@
+import logging
 from typing import Optional
 import numpy as np
 from ..base_indicator import BaseIndicator
+from .._kernels import zscore_last
 
 class Volume3DIndicator(BaseIndicator):
     def __init__(self, config_manager, timeframe_manager):
         super().__init__(config_manager, timeframe_manager, 'top')
+        # Score memoized against the data versions of its inputs; reused until a bar changes
+        self._memo_key = None
+        self._memo_score = None
 
     def get_indicator_name(self) -> str:
         return '3d_volume'
 
+    @staticmethod
+    def _score_timeframe(volumes: np.ndarray, prices: np.ndarray) -> Optional[float]:
+        """Volume z-score of the last bar, adjusted for the 10-bar price trend"""
+        if len(volumes) < 20:
+            return None
+
+        # Calculate volume z-score for this timeframe
+        z_score = zscore_last(volumes[-20:])
+        if np.isnan(z_score):
+            return None
+
+        # For tops: high volume during uptrends is bearish
+        # Check price trend for context
+        if len(prices) < 10:
+            return max(0, z_score / 2.0)
+        price_change = (prices[-1] - prices[-10]) / prices[-10]
+
+        # If price is rising and volume is high, it's a top signal
+        if price_change > 0 and z_score > 1.5:
+            # High volume in uptrend = distribution signal
+            return min(z_score / 2.0, 4.0)
+        elif price_change > 0 and z_score > 0.5:
+            # Moderate volume in uptrend
+            return z_score
+        elif price_change < 0 and z_score > 2.0:
+            # High volume in downtrend = continuation (bearish)
+            return min(z_score / 1.5, 3.0)
+        else:
+            # Normal volume patterns
+            return max(0, z_score / 2.0)
+
     def calculate_raw_value(self) -> Optional[float]:
         """
         Calculate 3D Volume indicator
@@ -18,49 +54,24 @@ class Volume3DIndicator(BaseIndicator):
         try:
             # Get volume data from multiple timeframes
             timeframes = ['3D', 'D', 'W']
+            tf_datas = [self.tf_manager.get_timeframe_data(tf) for tf in timeframes]
+
+            # Same bars as the last evaluation give the same score
+            memo_key = tuple(
+                None if tf_data is None else self.tf_manager.indicator_cache.data_version(tf_data)
+                for tf_data in tf_datas
+            )
+            if memo_key == self._memo_key:
+                return self._memo_score
+
             volume_scores = []
 
-            for tf in timeframes:
-                tf_data = self.tf_manager.get_timeframe_data(tf)
+            for tf_data in tf_datas:
                 if tf_data is None:
                     continue
 
-                volume_series = tf_data['ohlcv']['volume']
-                if len(volume_series) < 20:
-                    continue
-
-                # Calculate volume z-score for this timeframe
-                current_volume = volume_series.iloc[-1]
-                recent_volume = volume_series.tail(20)
-
-                mean_volume = recent_volume.mean()
-                std_volume = recent_volume.std()
-
-                if std_volume > 0:
-                    z_score = (current_volume - mean_volume) / std_volume
-
-                    # For tops: high volume during uptrends is bearish
-                    # Check price trend for context
-                    prices = tf_data['ohlcv']['close']
-                    if len(prices) >= 10:
-                        price_change = (prices.iloc[-1] - prices.iloc[-10]) / prices.iloc[-10]
-
-                        # If price is rising and volume is high, it's a top signal
-                        if price_change > 0 and z_score > 1.5:
-                            # High volume in uptrend = distribution signal
-                            volume_score = min(z_score / 2.0, 4.0)
-                        elif price_change > 0 and z_score > 0.5:
-                            # Moderate volume in uptrend
-                            volume_score = z_score
-                        elif price_change < 0 and z_score > 2.0:
-                            # High volume in downtrend = continuation (bearish)
-                            volume_score = min(z_score / 1.5, 3.0)
-                        else:
-                            # Normal volume patterns
-                            volume_score = max(0, z_score / 2.0)
-                    else:
-                        volume_score = max(0, z_score / 2.0)
-
+                volume_score = self._score_timeframe(tf_data['arr'].volume, tf_data['arr'].close)
+                if volume_score is not None:
                     volume_scores.append(volume_score)
 
             if not volume_scores:
@@ -93,12 +104,15 @@ class Volume3DIndicator(BaseIndicator):
             # Cap the final score
             final_score = min(weighted_score, 4.0)
 
-            self.logger.info(f"3D Volume Analysis:")
-            self.logger.info(f"  Volume scores by timeframe: {volume_scores}")
-            self.logger.info(f"  Weighted score: {weighted_score:.4f}")
-            self.logger.info(f"  Final 3D volume score: {final_score:.4f}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("3D Volume Analysis:")
+                self.logger.info("  Volume scores by timeframe: %s", volume_scores)
+                self.logger.info("  Weighted score: %.4f", weighted_score)
+                self.logger.info("  Final 3D volume score: %.4f", final_score)
 
-            return float(final_score)
+            self._memo_key = memo_key
+            self._memo_score = float(final_score)
+            return self._memo_score
 
         except Exception as e:
             self.logger.error(f"Error calculating 3D Volume: {e}")
@@ -2,6 +2,11 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 from ..base_indicator import BaseIndicator
+from .._kernels import wavetrend_tci, slope1
+
+# WaveTrend level ladder: a value above a threshold moves up one label (thresholds are exclusive)
+WAVETREND_LEVELS = np.array([-60.0, -40.0, 40.0, 60.0])
+WAVETREND_LABELS = ("Deeply Oversold", "Oversold", "Neutral", "Elevated", "Overbought")
 
 class WavetrendOscillatorIndicator(BaseIndicator):
     def __init__(self, config_manager, timeframe_manager):
@@ -10,46 +15,34 @@ class WavetrendOscillatorIndicator(BaseIndicator):
     def get_indicator_name(self) -> str:
         return 'wavetrend_oscillator'
 
-    def calculate_wavetrend(self, prices: pd.Series, channel_length: int = 10, average_length: int = 21) -> Optional[pd.Series]:
-        """
-        Calculate WaveTrend Oscillator
-        Similar to LazyBear's WaveTrend indicator
-        """
+    def calculate_wavetrend_values(self, ap: np.ndarray, channel_length: int = 10, average_length: int = 21) -> Optional[np.ndarray]:
+        """WaveTrend (TCI) of a float64 price array, as an ndarray"""
         try:
-            if len(prices) < max(channel_length, average_length) + 10:
+            if len(ap) < max(channel_length, average_length) + 10:
                 return None
 
-            # Calculate AP (Average Price) - typically HLC3
-            # Since we only have close prices, we'll use close
-            ap = prices
-
-            # Calculate ESA (Exponential Moving Average of AP)
-            esa = ap.ewm(span=channel_length).mean()
-
-            # Calculate absolute difference
-            d = (ap - esa).abs()
-
-            # Calculate ESA of the absolute difference
-            d_ema = d.ewm(span=channel_length).mean()
-
-            # Calculate CI (Channel Index)
-            ci = (ap - esa) / (0.015 * d_ema)
-
-            # Replace infinities and NaNs
-            ci = ci.replace([np.inf, -np.inf], np.nan).fillna(0)
-
-            # Calculate TCI (True Channel Index) - EMA of CI
-            tci = ci.ewm(span=average_length).mean()
-
-            # WaveTrend oscillates around 0, typically between -100 and +100
-            wavetrend = tci
-
-            return wavetrend
+            # ESA, the deviation EMA, CI and TCI (True Channel Index) are fused into one pass
+            return wavetrend_tci(ap, channel_length, average_length)
 
         except Exception as e:
             self.logger.error(f"Error calculating WaveTrend: {e}")
             return None
 
+    def calculate_wavetrend(self, prices: pd.Series, channel_length: int = 10, average_length: int = 21) -> Optional[pd.Series]:
+        """
+        Calculate WaveTrend Oscillator
+        Similar to LazyBear's WaveTrend indicator
+        """
+        # Calculate AP (Average Price) - typically HLC3
+        # Since we only have close prices, we'll use close
+        ap = prices.to_numpy(dtype=np.float64, copy=False)
+        tci = self.calculate_wavetrend_values(ap, channel_length, average_length)
+        if tci is None:
+            return None
+
+        # WaveTrend oscillates around 0, typically between -100 and +100
+        return pd.Series(tci, index=prices.index)
+
     def calculate_raw_value(self) -> Optional[float]:
         """
         Calculate WaveTrend Oscillator
@@ -63,28 +56,32 @@ class WavetrendOscillatorIndicator(BaseIndicator):
                 self.logger.error("Failed to get daily data")
                 return None
 
-            prices = daily_data['ohlcv']['close']
+            prices = daily_data['arr'].close
             if len(prices) < 50:  # Need sufficient data
                 self.logger.error("Insufficient price data for WaveTrend")
                 return None
 
-            # Calculate WaveTrend
-            wavetrend = self.calculate_wavetrend(prices)
+            # Calculate WaveTrend on the raw close array; no Series is built on this path.
+            # The series only changes with the daily bars, so it is memoized per data version
+            wt_values = self.tf_manager.indicator_cache.get_or_compute(
+                'D', daily_data, ('wavetrend', 10, 21),
+                lambda: self.calculate_wavetrend_values(prices)
+            )
 
-            if wavetrend is None or wavetrend.isna().iloc[-1]:
+            if wt_values is None or np.isnan(wt_values[-1]):
                 self.logger.error("WaveTrend calculation failed")
                 return None
 
-            current_wt = wavetrend.iloc[-1]
+            current_wt = wt_values[-1]
 
             # Additional analysis: divergence detection
-            recent_wt = wavetrend.tail(10)
-            recent_prices = prices.tail(10)
+            recent_wt = wt_values[-10:]
+            recent_prices = prices[-10:]
 
             if len(recent_wt) >= 5:
-                # Simple divergence check
-                wt_trend = np.polyfit(range(len(recent_wt)), recent_wt, 1)[0]
-                price_trend = np.polyfit(range(len(recent_prices)), recent_prices, 1)[0]
+                # Simple divergence check: closed-form least-squares slopes
+                wt_trend = slope1(recent_wt)
+                price_trend = slope1(recent_prices)
 
                 # Bearish divergence: price making higher highs, WaveTrend making lower highs
                 divergence_factor = 1.0
@@ -98,16 +95,7 @@ class WavetrendOscillatorIndicator(BaseIndicator):
                 adjusted_wt = current_wt
 
             # Analyze overbought/oversold levels
-            if current_wt > 60:
-                level = "Overbought"
-            elif current_wt > 40:
-                level = "Elevated"
-            elif current_wt > -40:
-                level = "Neutral"
-            elif current_wt > -60:
-                level = "Oversold"
-            else:
-                level = "Deeply Oversold"
+            level = WAVETREND_LABELS[np.searchsorted(WAVETREND_LEVELS, current_wt, side='left')]
 
             self.logger.info(f"WaveTrend Oscillator: {current_wt:.2f} ({level})")
             if 'divergence_factor' in locals():
@@ -1,88 +1,237 @@
+import queue
 import sqlite3
 import json
 import logging
+import threading
+import time
+import weakref
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
+
+# Bumped whenever init_database gains a schema change or migration; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+# Table definitions keyed by name; `{name}` lets a table be recreated under a temporary name.
+# Timestamps are stored as INTEGER Unix epoch microseconds
+TABLE_SCHEMAS = {
+    'calculations': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            calculation_type TEXT NOT NULL,
+            composite_score REAL,
+            data_quality_score REAL,
+            duration_seconds REAL,
+            raw_data TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'indicator_results': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            calculation_id INTEGER,
+            indicator_name TEXT NOT NULL,
+            indicator_type TEXT NOT NULL,
+            raw_value REAL,
+            normalized_score REAL,
+            weight REAL,
+            bounds_lower REAL,
+            bounds_upper REAL,
+            timestamp INTEGER NOT NULL,
+            success BOOLEAN,
+            error_message TEXT,
+            FOREIGN KEY (calculation_id) REFERENCES calculations (id) ON DELETE CASCADE
+        )
+    """,
+    'data_sources_status': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            source_name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            response_time_ms REAL,
+            error_message TEXT,
+            data_quality TEXT
+        )
+    """,
+    'system_logs': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp INTEGER NOT NULL,
+            level TEXT NOT NULL,
+            component TEXT NOT NULL,
+            message TEXT NOT NULL,
+            details TEXT
+        )
+    """,
+}
+
+# Insert statements kept as constants so every call reuses the same cached prepared statement
+INSERT_CALCULATION = """
+    INSERT INTO calculations
+    (timestamp, calculation_type, composite_score, data_quality_score, duration_seconds, raw_data)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+INSERT_INDICATOR_RESULT = """
+    INSERT INTO indicator_results
+    (calculation_id, indicator_name, indicator_type, raw_value, normalized_score,
+     weight, bounds_lower, bounds_upper, timestamp, success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _epoch_us(timestamp: Any) -> Any:
+    """Unix epoch microseconds for a datetime or ISO string (naive values are local time)"""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp() * 1_000_000)
+    return timestamp
+
+def _from_epoch_us(timestamp: Any) -> Any:
+    """Local ISO string for a stored epoch-microsecond timestamp"""
+    if isinstance(timestamp, int):
+        return datetime.fromtimestamp(timestamp / 1_000_000).isoformat()
+    return timestamp
+
+def _json_dumps(value: Any) -> str:
+    """
+    Serialize to JSON text, with orjson when installed (NaN is stored as null there).
+    Datetimes and other values JSON has no type for are stored as strings.
+    """
+    if orjson is not None:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(value, default=str, option=options).decode()
+    return json.dumps(value, default=str)
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON, with orjson when installed (stdlib fallback for legacy NaN literals)"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+def _cutoff(**delta) -> int:
+    """Epoch-microsecond timestamp `delta` ago, for indexed range filters"""
+    return _epoch_us(datetime.now() - timedelta(**delta))
+
+def _write_logs(log_queue: queue.Queue, lock: threading.Lock, conn: sqlite3.Connection,
+                logger: logging.Logger, batch_size: int, flush_seconds: float):
+    """Background writer: drain queued system log rows and insert each batch in one transaction"""
+    stop = False
+    while not stop:
+        row = log_queue.get()
+        if row is None:
+            break
+
+        rows = [row]
+        deadline = time.monotonic() + flush_seconds
+        while len(rows) < batch_size:
+            try:
+                row = log_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if row is None:
+                stop = True
+                break
+            rows.append(row)
+
+        try:
+            with lock, conn:
+                conn.executemany("""
+                    INSERT INTO system_logs (timestamp, level, component, message, details)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} system events: {e}")
+
+def _shutdown(log_queue: queue.Queue, writer: threading.Thread, lock: threading.Lock, conn: sqlite3.Connection):
+    """Stop the log writer once its queue is drained, then close the connection"""
+    if writer.is_alive():
+        log_queue.put(None)
+        writer.join()
+    with lock:
+        conn.close()
+
 class IndicatorDatabase:
+    # System log rows are written behind by a background thread in batches of up to
+    # LOG_BATCH_SIZE rows, collected for at most LOG_FLUSH_SECONDS after the first one
+    LOG_BATCH_SIZE = 256
+    LOG_FLUSH_SECONDS = 0.2
+    LOG_QUEUE_SIZE = 10000
+
     def __init__(self, db_path: str = "btc_indicators.db"):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
-        self.init_database()
+        # One long-lived connection shared by all calls; the lock serializes access to it
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        # Schema creation and migrations only run when the file predates the current schema
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self.init_database()
+        # Enforced only after init: table rebuilds drop parent tables, which would cascade
+        self._conn.execute("PRAGMA foreign_keys=ON")
+
+        # The writer thread and the finalizer only hold the queue, lock and connection, never self,
+        # so an unreferenced database is still collected; the finalizer also runs at interpreter exit
+        self._log_queue = queue.Queue(maxsize=self.LOG_QUEUE_SIZE)
+        self._log_writer = threading.Thread(
+            target=_write_logs,
+            args=(self._log_queue, self._lock, self._conn, self.logger, self.LOG_BATCH_SIZE, self.LOG_FLUSH_SECONDS),
+            name='system-log-writer',
+            daemon=True
+        )
+        self._log_writer.start()
+        self._finalizer = weakref.finalize(self, _shutdown, self._log_queue, self._log_writer, self._lock, self._conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection and apply performance pragmas"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")
+        return conn
+
+    def close(self):
+        """Flush queued system logs and close the shared connection"""
+        self._finalizer()
+        self._conn = None
 
     def init_database(self):
         """Initialize database with required tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
 
-                # Create calculations table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS calculations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        calculation_type TEXT NOT NULL,
-                        composite_score REAL,
-                        data_quality_score REAL,
-                        duration_seconds REAL,
-                        raw_data TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Create individual indicators table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS indicator_results (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        calculation_id INTEGER,
-                        indicator_name TEXT NOT NULL,
-                        indicator_type TEXT NOT NULL,
-                        raw_value REAL,
-                        normalized_score REAL,
-                        weight REAL,
-                        bounds_lower REAL,
-                        bounds_upper REAL,
-                        timestamp TEXT NOT NULL,
-                        success BOOLEAN,
-                        error_message TEXT,
-                        FOREIGN KEY (calculation_id) REFERENCES calculations (id)
-                    )
-                """)
-
-                # Create data sources status table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS data_sources_status (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        source_name TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        response_time_ms REAL,
-                        error_message TEXT,
-                        data_quality TEXT
-                    )
-                """)
-
-                # Create system logs table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS system_logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        level TEXT NOT NULL,
-                        component TEXT NOT NULL,
-                        message TEXT NOT NULL,
-                        details TEXT
-                    )
-                """)
+                for name, schema in TABLE_SCHEMAS.items():
+                    cursor.execute(schema.format(name=name))
+
+                self._migrate_text_timestamps(conn)
+                self._migrate_cascading_results(conn)
 
                 # Create indexes for better performance
+                # Composite (filter column, timestamp) indexes serve the history queries as range scans
+                # and make the single-column type/name indexes redundant
+                cursor.execute("DROP INDEX IF EXISTS idx_calculations_type")
+                cursor.execute("DROP INDEX IF EXISTS idx_indicators_name")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_calculations_timestamp ON calculations(timestamp)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_calculations_type ON calculations(calculation_type)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_indicators_name ON indicator_results(indicator_name)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_calculations_type_ts ON calculations(calculation_type, timestamp DESC)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_indicators_name_ts ON indicator_results(indicator_name, timestamp DESC)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_indicators_type ON indicator_results(indicator_type)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_indicators_calculation ON indicator_results(calculation_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_data_sources_timestamp ON data_sources_status(timestamp)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON system_logs(timestamp)")
 
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
                 conn.commit()
                 self.logger.info("Database initialized successfully")
 
@@ -90,54 +239,73 @@ class IndicatorDatabase:
             self.logger.error(f"Error initializing database: {e}")
             raise
 
+    def _rebuild_table(self, conn: sqlite3.Connection, name: str, select_columns: Dict[str, str]):
+        """Recreate a table from its current schema definition, copying rows through SQL expressions"""
+        cursor = conn.cursor()
+        columns = ', '.join(select_columns)
+        cursor.execute(TABLE_SCHEMAS[name].format(name=f"{name}_new"))
+        cursor.execute(f"INSERT INTO {name}_new ({columns}) SELECT {', '.join(select_columns.values())} FROM {name}")
+        cursor.execute(f"DROP TABLE {name}")
+        cursor.execute(f"ALTER TABLE {name}_new RENAME TO {name}")
+
+    def _migrate_text_timestamps(self, conn: sqlite3.Connection):
+        """One-shot migration of tables created with ISO TEXT timestamps to epoch microseconds"""
+        conn.create_function('epoch_us', 1, _epoch_us, deterministic=True)
+        for name in TABLE_SCHEMAS:
+            table_info = conn.execute(f"PRAGMA table_info({name})").fetchall()
+            if next(row[2] for row in table_info if row[1] == 'timestamp').upper() != 'TEXT':
+                continue
+
+            self.logger.info(f"Migrating {name} timestamps to epoch microseconds")
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            select_columns = {row[1]: 'epoch_us(timestamp)' if row[1] == 'timestamp' else row[1] for row in table_info}
+            self._rebuild_table(conn, name, select_columns)
+
+    def _migrate_cascading_results(self, conn: sqlite3.Connection):
+        """One-shot rebuild of indicator_results tables whose calculation FK does not cascade deletes"""
+        foreign_keys = conn.execute("PRAGMA foreign_key_list(indicator_results)").fetchall()
+        if all(row[6].upper() == 'CASCADE' for row in foreign_keys if row[2] == 'calculations'):
+            return
+
+        self.logger.info("Migrating indicator_results to cascade calculation deletes")
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(indicator_results)").fetchall()]
+        self._rebuild_table(conn, 'indicator_results', {column: column for column in columns})
+
     def store_calculation(self, results: Dict[str, Any]) -> Optional[int]:
         """Store a complete calculation result"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
 
                 # Extract calculation info
                 calc_info = results.get('calculation_info', {})
-                timestamp = calc_info.get('start_time', datetime.now()).isoformat()
+                timestamp = _epoch_us(calc_info.get('start_time', datetime.now()))
                 duration = calc_info.get('duration_seconds', 0)
 
-                # Store bottom calculation
-                bottom_id = None
-                if 'bottom_analysis' in results:
-                    bottom_analysis = results['bottom_analysis']
-                    composite_score = bottom_analysis.get('composite_score')
-                    data_quality = bottom_analysis.get('data_quality', {}).get('success_rate', 0)
-
-                    cursor.execute("""
-                        INSERT INTO calculations
-                        (timestamp, calculation_type, composite_score, data_quality_score, duration_seconds, raw_data)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (timestamp, 'bottom', composite_score, data_quality, duration, json.dumps(bottom_analysis)))
+                # Store bottom then top calculation; both share one prepared INSERT statement
+                calculation_ids = {}
+                for calc_type in ('bottom', 'top'):
+                    analysis = results.get(f'{calc_type}_analysis')
+                    if analysis is None:
+                        calculation_ids[calc_type] = None
+                        continue
 
-                    bottom_id = cursor.lastrowid
+                    composite_score = analysis.get('composite_score')
+                    data_quality = analysis.get('data_quality', {}).get('success_rate', 0)
 
-                    # Store individual bottom indicators
-                    if 'individual_indicators' in bottom_analysis:
-                        self._store_individual_indicators(cursor, bottom_id, bottom_analysis['individual_indicators'])
+                    cursor.execute(INSERT_CALCULATION, (
+                        timestamp, calc_type, composite_score, data_quality, duration, _json_dumps(analysis)
+                    ))
+                    calculation_ids[calc_type] = cursor.lastrowid
 
-                # Store top calculation
-                top_id = None
-                if 'top_analysis' in results:
-                    top_analysis = results['top_analysis']
-                    composite_score = top_analysis.get('composite_score')
-                    data_quality = top_analysis.get('data_quality', {}).get('success_rate', 0)
+                    # Store individual indicators
+                    if 'individual_indicators' in analysis:
+                        self._store_individual_indicators(cursor, cursor.lastrowid, analysis['individual_indicators'])
 
-                    cursor.execute("""
-                        INSERT INTO calculations
-                        (timestamp, calculation_type, composite_score, data_quality_score, duration_seconds, raw_data)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (timestamp, 'top', composite_score, data_quality, duration, json.dumps(top_analysis)))
-
-                    top_id = cursor.lastrowid
-
-                    # Store individual top indicators
-                    if 'individual_indicators' in top_analysis:
-                        self._store_individual_indicators(cursor, top_id, top_analysis['individual_indicators'])
+                bottom_id, top_id = calculation_ids['bottom'], calculation_ids['top']
 
                 conn.commit()
                 self.logger.info(f"Stored calculation results - Bottom ID: {bottom_id}, Top ID: {top_id}")
@@ -148,64 +316,66 @@ class IndicatorDatabase:
             return None
 
     def _store_individual_indicators(self, cursor, calculation_id: int, indicators: Dict[str, Any]):
-        """Store individual indicator results"""
-        for indicator_name, result in indicators.items():
-            try:
-                bounds = result.get('bounds', {})
-                timestamp = result.get('timestamp', datetime.now())
-                if isinstance(timestamp, datetime):
-                    timestamp = timestamp.isoformat()
-
-                cursor.execute("""
-                    INSERT INTO indicator_results
-                    (calculation_id, indicator_name, indicator_type, raw_value, normalized_score,
-                     weight, bounds_lower, bounds_upper, timestamp, success, error_message)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    calculation_id,
-                    indicator_name,
-                    result.get('type'),
-                    result.get('raw_value'),
-                    result.get('normalized_score'),
-                    result.get('weight'),
-                    bounds.get('lower'),
-                    bounds.get('upper'),
-                    timestamp,
-                    result.get('normalized_score') is not None,
-                    result.get('error')
-                ))
-
-            except Exception as e:
-                self.logger.error(f"Error storing indicator {indicator_name}: {e}")
+        """Store individual indicator results in one batched insert"""
+        rows = [
+            (
+                calculation_id,
+                indicator_name,
+                result.get('type'),
+                result.get('raw_value'),
+                result.get('normalized_score'),
+                result.get('weight'),
+                (result.get('bounds') or {}).get('lower'),
+                (result.get('bounds') or {}).get('upper'),
+                _epoch_us(result.get('timestamp', datetime.now())),
+                result.get('normalized_score') is not None,
+                result.get('error')
+            )
+            for indicator_name, result in indicators.items()
+        ]
+
+        # The savepoint lets a failed batch be undone without losing the calculation row
+        cursor.execute("SAVEPOINT indicator_batch")
+        try:
+            cursor.executemany(INSERT_INDICATOR_RESULT, rows)
+        except Exception:
+            # Slow path, only on failure: insert row by row to keep the good rows and name the bad ones
+            cursor.execute("ROLLBACK TO indicator_batch")
+            for row in rows:
+                try:
+                    cursor.execute(INSERT_INDICATOR_RESULT, row)
+                except Exception as e:
+                    self.logger.error(f"Error storing indicator {row[1]}: {e}")
+        cursor.execute("RELEASE indicator_batch")
 
     def get_recent_calculations(self, hours: int = 24, calc_type: str = None) -> List[Dict[str, Any]]:
         """Get recent calculations"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
 
-                where_clause = "WHERE datetime(timestamp) > datetime('now', '-{} hours')".format(hours)
+                where_clause = "WHERE timestamp > ?"
+                params = [_cutoff(hours=hours)]
                 if calc_type:
-                    where_clause += f" AND calculation_type = '{calc_type}'"
+                    where_clause += " AND calculation_type = ?"
+                    params.append(calc_type)
 
                 cursor.execute(f"""
                     SELECT * FROM calculations
                     {where_clause}
                     ORDER BY timestamp DESC
-                """)
+                """, params)
 
-                columns = [description[0] for description in cursor.description]
-                results = []
+                results = [dict(row) for row in cursor.fetchall()]
 
-                for row in cursor.fetchall():
-                    result = dict(zip(columns, row))
+                for result in results:
+                    result['timestamp'] = _from_epoch_us(result['timestamp'])
                     # Parse raw_data JSON
                     if result['raw_data']:
                         try:
-                            result['raw_data'] = json.loads(result['raw_data'])
-                        except:
+                            result['raw_data'] = _json_loads(result['raw_data'])
+                        except ValueError:
                             pass
-                    results.append(result)
 
                 return results
 
@@ -216,21 +386,19 @@ class IndicatorDatabase:
     def get_indicator_history(self, indicator_name: str, days: int = 30) -> List[Dict[str, Any]]:
         """Get historical data for a specific indicator"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
 
                 cursor.execute("""
                     SELECT * FROM indicator_results
                     WHERE indicator_name = ?
-                    AND datetime(timestamp) > datetime('now', '-{} days')
+                    AND timestamp > ?
                     ORDER BY timestamp DESC
-                """.format(days), (indicator_name,))
-
-                columns = [description[0] for description in cursor.description]
-                results = []
+                """, (indicator_name, _cutoff(days=days)))
 
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
+                results = [dict(row) for row in cursor.fetchall()]
+                for result in results:
+                    result['timestamp'] = _from_epoch_us(result['timestamp'])
 
                 return results
 
@@ -239,23 +407,15 @@ class IndicatorDatabase:
             return []
 
     def log_system_event(self, level: str, component: str, message: str, details: Dict[str, Any] = None):
-        """Log system events"""
+        """Log system events (queued; written behind in batches)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                cursor.execute("""
-                    INSERT INTO system_logs (timestamp, level, component, message, details)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    datetime.now().isoformat(),
-                    level,
-                    component,
-                    message,
-                    json.dumps(details) if details else None
-                ))
-
-                conn.commit()
+            self._log_queue.put((
+                _epoch_us(datetime.now()),
+                level,
+                component,
+                message,
+                _json_dumps(details) if details else None
+            ))
 
         except Exception as e:
             self.logger.error(f"Error logging system event: {e}")
@@ -263,34 +423,30 @@ class IndicatorDatabase:
     def cleanup_old_data(self, days: int = 90):
         """Clean up old data to manage database size"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
+                cutoff = _cutoff(days=days)
 
-                # Clean old calculations and related indicators
-                cursor.execute("""
-                    DELETE FROM indicator_results
-                    WHERE calculation_id IN (
-                        SELECT id FROM calculations
-                        WHERE datetime(timestamp) < datetime('now', '-{} days')
-                    )
-                """.format(days))
+                # All deletes share one write transaction, so WAL commits once
+                cursor.execute("BEGIN IMMEDIATE")
 
+                # Clean old calculations; their indicator results go with them via ON DELETE CASCADE
                 cursor.execute("""
                     DELETE FROM calculations
-                    WHERE datetime(timestamp) < datetime('now', '-{} days')
-                """.format(days))
+                    WHERE timestamp < ?
+                """, (cutoff,))
 
                 # Clean old logs
                 cursor.execute("""
                     DELETE FROM system_logs
-                    WHERE datetime(timestamp) < datetime('now', '-{} days')
-                """.format(days))
+                    WHERE timestamp < ?
+                """, (cutoff,))
 
                 # Clean old data source status
                 cursor.execute("""
                     DELETE FROM data_sources_status
-                    WHERE datetime(timestamp) < datetime('now', '-{} days')
-                """.format(days))
+                    WHERE timestamp < ?
+                """, (cutoff,))
 
                 conn.commit()
                 self.logger.info(f"Cleaned up data older than {days} days")
@@ -301,28 +457,27 @@ class IndicatorDatabase:
     def get_database_stats(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
 
                 stats = {}
 
-                # Count records in each table
+                # Count records in each table and recent activity in one statement
                 tables = ['calculations', 'indicator_results', 'data_sources_status', 'system_logs']
-                for table in tables:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    stats[f"{table}_count"] = cursor.fetchone()[0]
+                counts = ', '.join(f"(SELECT COUNT(*) FROM {table}) AS {table}_count" for table in tables)
+                cursor.execute(f"""
+                    SELECT {counts},
+                           (SELECT COUNT(*) FROM calculations WHERE timestamp > ?) AS calculations_last_24h
+                """, (_cutoff(hours=24),))
+                row = cursor.fetchone()
+                stats.update({f"{table}_count": row[f"{table}_count"] for table in tables})
 
                 # Database file size
                 db_file = Path(self.db_path)
                 if db_file.exists():
                     stats['database_size_mb'] = db_file.stat().st_size / (1024 * 1024)
 
-                # Recent activity
-                cursor.execute("""
-                    SELECT COUNT(*) FROM calculations
-                    WHERE datetime(timestamp) > datetime('now', '-24 hours')
-                """)
-                stats['calculations_last_24h'] = cursor.fetchone()[0]
+                stats['calculations_last_24h'] = row['calculations_last_24h']
 
                 return stats
 
@@ -1,68 +1,230 @@
+import atexit
+import importlib.util
 import json
 import csv
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, BinaryIO, Iterator, List, Set, TextIO, Tuple
 from datetime import datetime
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; only the binary historical log needs it
+    msgpack = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; only the Parquet historical log needs it
+    pa = pq = None
+
+# xlsxwriter streams rows straight to the file; openpyxl builds every cell object in memory first
+EXCEL_ENGINE = 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') is not None else 'openpyxl'
+
+JSON_WRITE_BUFFER = 1 << 20
+FILE_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+# csv.writer's default row terminator, so pandas-written CSVs match the historical CSVs
+CSV_LINE_TERMINATOR = '\r\n'
+HISTORICAL_BASE_FIELDS = ('timestamp', 'composite_score', 'signal_strength', 'success_rate')
+
+PARQUET_FLUSH_ROWS = 1024
+
+if pa is not None:
+    # Scores are a map column so the schema stays fixed when the indicator set changes
+    HISTORICAL_PARQUET_SCHEMA = pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('composite_score', pa.float64()),
+        ('signal_strength', pa.string()),
+        ('success_rate', pa.float64()),
+        ('scores', pa.map_(pa.string(), pa.float64())),
+    ])
+
+if orjson is not None:
+    JSON_LOG_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the leaves the JSON encoders do not handle natively (timestamps, numpy scalars, missing values)"""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# Summary rows as (label, key path into the results); rows under an absent analysis are skipped
+SUMMARY_CSV_SCHEMA = [
+    ('Calculation Start', ('calculation_info', 'start_time')),
+    ('Calculation Duration (s)', ('calculation_info', 'duration_seconds')),
+    ('Current BTC Price', ('market_context', 'current_btc_price')),
+] + [
+    row
+    for key, label in (('bottom_analysis', 'Bottom'), ('top_analysis', 'Top'))
+    for row in (
+        (f'{label} Composite Score', (key, 'composite_score')),
+        (f'{label} Signal Strength', (key, 'interpretation', 'strength')),
+        (f'{label} Signal Description', (key, 'interpretation', 'description')),
+        (f'{label} Success Rate (%)', (key, 'data_quality', 'success_rate')),
+    )
+]
+
+SUMMARY_SHEET_SCHEMA = [
+    ('Calculation Start', ('calculation_info', 'start_time')),
+    ('Duration (seconds)', ('calculation_info', 'duration_seconds')),
+    ('Bottom Score', ('bottom_analysis', 'composite_score')),
+    ('Bottom Strength', ('bottom_analysis', 'interpretation', 'strength')),
+    ('Top Score', ('top_analysis', 'composite_score')),
+    ('Top Strength', ('top_analysis', 'interpretation', 'strength')),
+]
+
+OPTIONAL_SUMMARY_SECTIONS = frozenset(('bottom_analysis', 'top_analysis'))
+
+
+def _dig(results: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    """Follow a key path through nested dicts, returning None if any level is missing"""
+    value = results
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _summary_rows(results: Dict[str, Any], schema: List[Tuple[str, Tuple[str, ...]]]) -> List[List[Any]]:
+    """Evaluate a summary schema against the results"""
+    return [
+        [label, _dig(results, path)]
+        for label, path in schema
+        if path[0] in results or path[0] not in OPTIONAL_SUMMARY_SECTIONS
+    ]
+
+
+def _csv_value(value: Any) -> Any:
+    """A cell as csv.writer renders it: pandas writes NaN as an empty field, csv.writer as 'nan'"""
+    if isinstance(value, (float, np.floating)) and np.isnan(value):
+        return 'nan'
+    return value
+
+
+class _ResultsEncoder(json.JSONEncoder):
+    """Stdlib encoder that converts special leaves in place instead of copying the results tree"""
+
+    def default(self, o: Any) -> Any:
+        return _json_default(o)
+
+
+def _replace_nan(obj: Any) -> Any:
+    """Copy of a results tree with NaN floats replaced by None"""
+    if isinstance(obj, dict):
+        return {key: _replace_nan(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_replace_nan(item) for item in obj]
+    elif isinstance(obj, (float, np.floating)) and np.isnan(obj):
+        return None
+    return obj
+
+
 class FileLogger:
     def __init__(self, output_dir: str = "outputs"):
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
 
         # Create subdirectories
-        (self.output_dir / "json").mkdir(exist_ok=True)
-        (self.output_dir / "csv").mkdir(exist_ok=True)
-        (self.output_dir / "logs").mkdir(exist_ok=True)
+        self._json_dir = self.output_dir / "json"
+        self._csv_dir = self.output_dir / "csv"
+        self._log_dir = self.output_dir / "logs"
+        # parents=True creates output_dir with the first subdirectory; exist_ok swallows EEXIST without a prior stat
+        for directory in (self._json_dir, self._csv_dir, self._log_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        # Open append handles for the historical CSVs, reused across calls
+        self._hist_handles: Dict[Path, Tuple[TextIO, Tuple[str, ...], csv.DictWriter, Set[str]]] = {}
+        self._msgpack_handles: Dict[Path, BinaryIO] = {}
+        self._parquet_buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._parquet_writers: Dict[str, Any] = {}
+        self._packer = msgpack.Packer(use_bin_type=True, datetime=True) if msgpack is not None else None
+        atexit.register(self.close)
+
+    def close(self):
+        """Flush buffered Parquet rows and close the cached historical log handles"""
+        for analysis_type in list(self._parquet_buffers):
+            self._flush_historical_parquet(analysis_type)
+
+        handles = [entry[0] for entry in self._hist_handles.values()] + list(self._msgpack_handles.values())
+        handles.extend(self._parquet_writers.values())
+        for handle in handles:
+            try:
+                handle.close()
+            except Exception as e:
+                self.logger.error("Error closing historical log: %s", e)
+        self._hist_handles.clear()
+        self._msgpack_handles.clear()
+        self._parquet_writers.clear()
 
     def log_calculation_json(self, results: Dict[str, Any], filename: str = None) -> str:
         """Log calculation results to JSON file"""
         try:
             if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
                 filename = f"btc_indicators_{timestamp}.json"
 
-            filepath = self.output_dir / "json" / filename
-
-            # Prepare data for JSON serialization
-            json_data = self._prepare_for_json(results)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-
-            self.logger.info(f"Results logged to {filepath}")
+            filepath = self._json_dir / filename
+
+            if orjson is not None:
+                # orjson handles datetimes, NaN and numpy scalars natively, so no pre-pass is needed
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(results, default=_json_default, option=JSON_LOG_OPTIONS))
+            else:
+                # Stream the encoder's chunks through a large buffer instead of building the whole string
+                with open(filepath, 'w', encoding='utf-8', buffering=JSON_WRITE_BUFFER) as f:
+                    try:
+                        json.dump(results, f, cls=_ResultsEncoder, indent=2, ensure_ascii=False, allow_nan=False)
+                    except ValueError:
+                        # Only copy the tree when it actually holds NaN, which must be written as null
+                        f.seek(0)
+                        f.truncate()
+                        json.dump(_replace_nan(results), f, cls=_ResultsEncoder, indent=2, ensure_ascii=False)
+
+            self.logger.info("Results logged to %s", filepath)
             return str(filepath)
 
         except Exception as e:
-            self.logger.error(f"Error logging JSON: {e}")
+            self.logger.error("Error logging JSON: %s", e)
             return None
 
     def log_calculation_csv(self, results: Dict[str, Any]) -> str:
         """Log calculation results to CSV files"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
 
             # Log bottom indicators to CSV
             if 'bottom_analysis' in results and 'individual_indicators' in results['bottom_analysis']:
-                bottom_file = self.output_dir / "csv" / f"bottom_indicators_{timestamp}.csv"
+                bottom_file = self._csv_dir / f"bottom_indicators_{timestamp}.csv"
                 self._write_indicators_csv(results['bottom_analysis']['individual_indicators'], bottom_file)
 
             # Log top indicators to CSV
             if 'top_analysis' in results and 'individual_indicators' in results['top_analysis']:
-                top_file = self.output_dir / "csv" / f"top_indicators_{timestamp}.csv"
+                top_file = self._csv_dir / f"top_indicators_{timestamp}.csv"
                 self._write_indicators_csv(results['top_analysis']['individual_indicators'], top_file)
 
             # Log summary CSV
-            summary_file = self.output_dir / "csv" / f"summary_{timestamp}.csv"
+            summary_file = self._csv_dir / f"summary_{timestamp}.csv"
             self._write_summary_csv(results, summary_file)
 
-            self.logger.info(f"CSV files logged with timestamp {timestamp}")
+            self.logger.info("CSV files logged with timestamp %s", timestamp)
             return timestamp
 
         except Exception as e:
-            self.logger.error(f"Error logging CSV: {e}")
+            self.logger.error("Error logging CSV: %s", e)
             return None
 
     def _write_indicators_csv(self, indicators: Dict[str, Any], filepath: Path):
@@ -73,72 +235,37 @@ class FileLogger:
                 'weight', 'bounds_lower', 'bounds_upper', 'timestamp', 'success'
             ]
 
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for name, data in indicators.items():
-                    bounds = data.get('bounds', {})
-                    row = {
-                        'indicator_name': name,
-                        'indicator_type': data.get('type'),
-                        'raw_value': data.get('raw_value'),
-                        'normalized_score': data.get('normalized_score'),
-                        'weight': data.get('weight'),
-                        'bounds_lower': bounds.get('lower'),
-                        'bounds_upper': bounds.get('upper'),
-                        'timestamp': data.get('timestamp'),
-                        'success': data.get('normalized_score') is not None
-                    }
-                    writer.writerow(row)
+            names = list(indicators.keys())
+            records = [indicators[name] for name in names]
+            bounds = [data.get('bounds', {}) for data in records]
+            scores = [data.get('normalized_score') for data in records]
+
+            # Build whole columns once and let pandas' C writer serialize them in bulk
+            df = pd.DataFrame({
+                'indicator_name': names,
+                'indicator_type': [data.get('type') for data in records],
+                'raw_value': [_csv_value(data.get('raw_value')) for data in records],
+                'normalized_score': [_csv_value(score) for score in scores],
+                'weight': [_csv_value(data.get('weight')) for data in records],
+                'bounds_lower': [_csv_value(b.get('lower')) for b in bounds],
+                'bounds_upper': [_csv_value(b.get('upper')) for b in bounds],
+                'timestamp': [data.get('timestamp') for data in records],
+                'success': [score is not None for score in scores]
+            }, columns=fieldnames, dtype=object)
+            df.to_csv(filepath, index=False, encoding='utf-8', lineterminator=CSV_LINE_TERMINATOR)
 
         except Exception as e:
-            self.logger.error(f"Error writing indicators CSV: {e}")
+            self.logger.error("Error writing indicators CSV: %s", e)
 
     def _write_summary_csv(self, results: Dict[str, Any], filepath: Path):
         """Write summary data to CSV"""
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-
-                # Header
-                writer.writerow(['Metric', 'Value'])
-
-                # Calculation info
-                calc_info = results.get('calculation_info', {})
-                writer.writerow(['Calculation Start', calc_info.get('start_time')])
-                writer.writerow(['Calculation Duration (s)', calc_info.get('duration_seconds')])
-
-                # Market context
-                market_context = results.get('market_context', {})
-                writer.writerow(['Current BTC Price', market_context.get('current_btc_price')])
-
-                # Bottom analysis
-                if 'bottom_analysis' in results:
-                    bottom = results['bottom_analysis']
-                    writer.writerow(['Bottom Composite Score', bottom.get('composite_score')])
-
-                    interpretation = bottom.get('interpretation', {})
-                    writer.writerow(['Bottom Signal Strength', interpretation.get('strength')])
-                    writer.writerow(['Bottom Signal Description', interpretation.get('description')])
-
-                    data_quality = bottom.get('data_quality', {})
-                    writer.writerow(['Bottom Success Rate (%)', data_quality.get('success_rate')])
-
-                # Top analysis
-                if 'top_analysis' in results:
-                    top = results['top_analysis']
-                    writer.writerow(['Top Composite Score', top.get('composite_score')])
-
-                    interpretation = top.get('interpretation', {})
-                    writer.writerow(['Top Signal Strength', interpretation.get('strength')])
-                    writer.writerow(['Top Signal Description', interpretation.get('description')])
-
-                    data_quality = top.get('data_quality', {})
-                    writer.writerow(['Top Success Rate (%)', data_quality.get('success_rate')])
+            rows = [[label, _csv_value(value)] for label, value in _summary_rows(results, SUMMARY_CSV_SCHEMA)]
+            df = pd.DataFrame(rows, columns=['Metric', 'Value'], dtype=object)
+            df.to_csv(filepath, index=False, encoding='utf-8', lineterminator=CSV_LINE_TERMINATOR)
 
         except Exception as e:
-            self.logger.error(f"Error writing summary CSV: {e}")
+            self.logger.error("Error writing summary CSV: %s", e)
 
     def append_to_historical_csv(self, results: Dict[str, Any]):
         """Append results to historical CSV files for backtesting"""
@@ -147,64 +274,192 @@ class FileLogger:
 
             # Historical bottom data
             if 'bottom_analysis' in results:
-                bottom_csv = self.output_dir / "csv" / "historical_bottom.csv"
+                bottom_csv = self._csv_dir / "historical_bottom.csv"
                 self._append_historical_data(results['bottom_analysis'], bottom_csv, 'bottom', timestamp)
 
             # Historical top data
             if 'top_analysis' in results:
-                top_csv = self.output_dir / "csv" / "historical_top.csv"
+                top_csv = self._csv_dir / "historical_top.csv"
                 self._append_historical_data(results['top_analysis'], top_csv, 'top', timestamp)
 
             self.logger.info("Appended to historical CSV files")
 
         except Exception as e:
-            self.logger.error(f"Error appending to historical CSV: {e}")
+            self.logger.error("Error appending to historical CSV: %s", e)
+
+    def _historical_writer(self, filepath: Path, analysis: Dict[str, Any]) -> Tuple[TextIO, Tuple[str, ...], csv.DictWriter, Set[str]]:
+        """Return the cached append handle, fieldnames, writer and covered indicator names for a historical CSV"""
+        entry = self._hist_handles.get(filepath)
+        if entry is not None:
+            return entry
+
+        fieldnames = None
+        if filepath.exists():
+            # Reuse the existing header so appended rows line up with its columns
+            with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                fieldnames = next(csv.reader(f), None)
+
+        write_header = not fieldnames
+        if write_header:
+            fieldnames = HISTORICAL_BASE_FIELDS + tuple(f"{name}_score" for name in analysis.get('individual_indicators', {}))
+        fieldnames = tuple(fieldnames)
+        indicator_names = {field[:-len('_score')] for field in fieldnames[len(HISTORICAL_BASE_FIELDS):]}
+
+        handle = open(filepath, 'a', newline='', encoding='utf-8')
+        writer = csv.DictWriter(handle, fieldnames=fieldnames, extrasaction='ignore')
+        if write_header:
+            writer.writeheader()
+
+        entry = (handle, fieldnames, writer, indicator_names)
+        self._hist_handles[filepath] = entry
+        return entry
 
     def _append_historical_data(self, analysis: Dict[str, Any], filepath: Path, analysis_type: str, timestamp: datetime):
         """Append analysis data to historical CSV"""
         try:
-            # Check if file exists to determine if we need headers
-            file_exists = filepath.exists()
+            handle, _, writer, indicator_names = self._historical_writer(filepath, analysis)
+            indicators = analysis.get('individual_indicators', {})
+
+            # The header is fixed once written; report indicators it has no column for, once each
+            if not indicators.keys() <= indicator_names:
+                missing = sorted(indicators.keys() - indicator_names)
+                self.logger.warning("%s has no columns for %s; their scores are not recorded", filepath.name, missing)
+                indicator_names.update(missing)
+
+            # Prepare row data
+            row = {
+                'timestamp': timestamp.isoformat(),
+                'composite_score': analysis.get('composite_score'),
+                'signal_strength': analysis.get('interpretation', {}).get('strength'),
+                'success_rate': analysis.get('data_quality', {}).get('success_rate')
+            }
+
+            # Add individual indicator scores
+            for name, data in indicators.items():
+                row[f"{name}_score"] = data.get('normalized_score')
+
+            writer.writerow(row)
+            handle.flush()
 
-            with open(filepath, 'a', newline='', encoding='utf-8') as f:
-                fieldnames = ['timestamp', 'composite_score', 'signal_strength', 'success_rate']
+        except Exception as e:
+            self.logger.error("Error appending historical data: %s", e)
 
-                # Add individual indicator scores
-                if 'individual_indicators' in analysis:
-                    for indicator_name in analysis['individual_indicators'].keys():
-                        fieldnames.append(f"{indicator_name}_score")
+    def _historical_msgpack_path(self, analysis_type: str) -> Path:
+        """Path of the append-only MessagePack history for an analysis type"""
+        return self._csv_dir / f"historical_{analysis_type}.mpk"
 
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+    def append_to_historical_msgpack(self, results: Dict[str, Any]):
+        """Append results to the binary MessagePack history, one record per analysis"""
+        if msgpack is None:
+            self.logger.error("msgpack is not installed; skipping MessagePack history")
+            return
+
+        try:
+            # Aware timestamp so msgpack stores it as a native Timestamp extension
+            timestamp = datetime.now().astimezone()
 
-                # Write header if new file
-                if not file_exists:
-                    writer.writeheader()
+            for analysis_type in ('bottom', 'top'):
+                analysis = results.get(f'{analysis_type}_analysis')
+                if analysis is None:
+                    continue
 
-                # Prepare row data
-                row = {
-                    'timestamp': timestamp.isoformat(),
+                record = {
+                    'timestamp': timestamp,
                     'composite_score': analysis.get('composite_score'),
                     'signal_strength': analysis.get('interpretation', {}).get('strength'),
-                    'success_rate': analysis.get('data_quality', {}).get('success_rate')
+                    'success_rate': analysis.get('data_quality', {}).get('success_rate'),
+                    'scores': {
+                        name: data.get('normalized_score')
+                        for name, data in analysis.get('individual_indicators', {}).items()
+                    }
                 }
 
-                # Add individual indicator scores
-                if 'individual_indicators' in analysis:
-                    for name, data in analysis['individual_indicators'].items():
-                        row[f"{name}_score"] = data.get('normalized_score')
+                filepath = self._historical_msgpack_path(analysis_type)
+                handle = self._msgpack_handles.get(filepath)
+                if handle is None:
+                    handle = open(filepath, 'ab')
+                    self._msgpack_handles[filepath] = handle
+
+                handle.write(self._packer.pack(record))
+                handle.flush()
+
+            self.logger.info("Appended to historical MessagePack files")
+
+        except Exception as e:
+            self.logger.error("Error appending to historical MessagePack: %s", e)
+
+    def read_historical_msgpack(self, analysis_type: str) -> Iterator[Dict[str, Any]]:
+        """Iterate over the records of a MessagePack history, oldest first"""
+        filepath = self._historical_msgpack_path(analysis_type)
+        if msgpack is None or not filepath.exists():
+            return
+
+        with open(filepath, 'rb') as f:
+            yield from msgpack.Unpacker(f, raw=False, timestamp=3)
+
+    def append_to_historical_parquet(self, results: Dict[str, Any]):
+        """Buffer results for the Parquet history, writing a row group every PARQUET_FLUSH_ROWS records"""
+        if pa is None:
+            self.logger.error("pyarrow is not installed; skipping Parquet history")
+            return
+
+        try:
+            timestamp = datetime.now().astimezone()
+
+            for analysis_type in ('bottom', 'top'):
+                analysis = results.get(f'{analysis_type}_analysis')
+                if analysis is None:
+                    continue
+
+                buffer = self._parquet_buffers.setdefault(analysis_type, [])
+                buffer.append({
+                    'timestamp': timestamp,
+                    'composite_score': analysis.get('composite_score'),
+                    'signal_strength': analysis.get('interpretation', {}).get('strength'),
+                    'success_rate': analysis.get('data_quality', {}).get('success_rate'),
+                    'scores': [
+                        (name, data.get('normalized_score'))
+                        for name, data in analysis.get('individual_indicators', {}).items()
+                    ]
+                })
+
+                if len(buffer) >= PARQUET_FLUSH_ROWS:
+                    self._flush_historical_parquet(analysis_type)
+
+        except Exception as e:
+            self.logger.error("Error appending to historical Parquet: %s", e)
+
+    def _flush_historical_parquet(self, analysis_type: str):
+        """Write the buffered records of an analysis type as one Parquet row group"""
+        buffer = self._parquet_buffers.get(analysis_type)
+        if not buffer:
+            return
+
+        try:
+            writer = self._parquet_writers.get(analysis_type)
+            if writer is None:
+                # Parquet files cannot be reopened for append, so each session writes its own part file
+                directory = self._csv_dir / f"historical_{analysis_type}_parquet"
+                directory.mkdir(exist_ok=True)
+                filepath = directory / f"part_{datetime.now().strftime(FILE_TIMESTAMP_FORMAT)}.parquet"
+                writer = pq.ParquetWriter(filepath, HISTORICAL_PARQUET_SCHEMA, compression='zstd', use_dictionary=True)
+                self._parquet_writers[analysis_type] = writer
 
-                writer.writerow(row)
+            writer.write_table(pa.Table.from_pylist(buffer, schema=HISTORICAL_PARQUET_SCHEMA))
 
         except Exception as e:
-            self.logger.error(f"Error appending historical data: {e}")
+            self.logger.error("Error writing historical Parquet: %s", e)
+
+        finally:
+            buffer.clear()
 
     def create_excel_report(self, results: Dict[str, Any]) -> str:
         """Create comprehensive Excel report"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime(FILE_TIMESTAMP_FORMAT)
             filepath = self.output_dir / f"btc_indicators_report_{timestamp}.xlsx"
 
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            with pd.ExcelWriter(filepath, engine=EXCEL_ENGINE) as writer:
                 # Summary sheet
                 self._create_summary_sheet(results, writer)
 
@@ -220,33 +475,16 @@ class FileLogger:
                 if 'market_context' in results:
                     self._create_market_context_sheet(results['market_context'], writer)
 
-            self.logger.info(f"Excel report created: {filepath}")
+            self.logger.info("Excel report created: %s", filepath)
             return str(filepath)
 
         except Exception as e:
-            self.logger.error(f"Error creating Excel report: {e}")
+            self.logger.error("Error creating Excel report: %s", e)
             return None
 
     def _create_summary_sheet(self, results: Dict[str, Any], writer):
         """Create summary sheet for Excel report"""
-        summary_data = []
-
-        # Add calculation info
-        calc_info = results.get('calculation_info', {})
-        summary_data.append(['Calculation Start', calc_info.get('start_time')])
-        summary_data.append(['Duration (seconds)', calc_info.get('duration_seconds')])
-
-        # Add scores
-        if 'bottom_analysis' in results:
-            bottom = results['bottom_analysis']
-            summary_data.append(['Bottom Score', bottom.get('composite_score')])
-            summary_data.append(['Bottom Strength', bottom.get('interpretation', {}).get('strength')])
-
-        if 'top_analysis' in results:
-            top = results['top_analysis']
-            summary_data.append(['Top Score', top.get('composite_score')])
-            summary_data.append(['Top Strength', top.get('interpretation', {}).get('strength')])
-
+        summary_data = _summary_rows(results, SUMMARY_SHEET_SCHEMA)
         df = pd.DataFrame(summary_data, columns=['Metric', 'Value'])
         df.to_excel(writer, sheet_name='Summary', index=False)
 
@@ -255,20 +493,21 @@ class FileLogger:
         if 'individual_indicators' not in analysis:
             return
 
-        indicators_data = []
-        for name, data in analysis['individual_indicators'].items():
-            bounds = data.get('bounds', {})
-            indicators_data.append({
-                'Indicator': name,
-                'Raw Value': data.get('raw_value'),
-                'Normalized Score': data.get('normalized_score'),
-                'Weight': data.get('weight'),
-                'Lower Bound': bounds.get('lower'),
-                'Upper Bound': bounds.get('upper'),
-                'Success': 'Yes' if data.get('normalized_score') is not None else 'No'
-            })
-
-        df = pd.DataFrame(indicators_data)
+        indicators = analysis['individual_indicators']
+        records = list(indicators.values())
+        bounds = [data.get('bounds', {}) for data in records]
+        scores = [data.get('normalized_score') for data in records]
+
+        # Build the columns directly rather than a list of row dicts pandas has to transpose
+        df = pd.DataFrame({
+            'Indicator': list(indicators.keys()),
+            'Raw Value': [data.get('raw_value') for data in records],
+            'Normalized Score': scores,
+            'Weight': [data.get('weight') for data in records],
+            'Lower Bound': [b.get('lower') for b in bounds],
+            'Upper Bound': [b.get('upper') for b in bounds],
+            'Success': ['Yes' if score is not None else 'No' for score in scores]
+        })
         df.to_excel(writer, sheet_name=sheet_name, index=False)
 
     def _create_market_context_sheet(self, market_context: Dict[str, Any], writer):
@@ -280,16 +519,3 @@ class FileLogger:
 
         df = pd.DataFrame(context_data, columns=['Metric', 'Value'])
         df.to_excel(writer, sheet_name='Market Context', index=False)
-
-    def _prepare_for_json(self, obj: Any) -> Any:
-        """Prepare object for JSON serialization"""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {key: self._prepare_for_json(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._prepare_for_json(item) for item in obj]
-        elif pd.isna(obj):
-            return None
-        else:
-            return obj
\ No newline at end of file
@@ -1,3 +1,4 @@
+import importlib.util
 import unittest
 import sys
 from pathlib import Path
@@ -13,28 +14,27 @@ from src.indicators.timeframe_manager import TimeframeManager
 from src.data_adapters.tradingview_adapter import TradingViewAdapter
 
 class TestIndicators(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Set up read-only mock data shared by every test"""
+        rng = np.random.default_rng(42)
+        ohlcv = rng.standard_normal((100, 5)) * [1000, 1000, 1000, 1000, 20000] + [45000, 46000, 44000, 45000, 100000]
+        cls.mock_ohlcv = pd.DataFrame(ohlcv, columns=['open', 'high', 'low', 'close', 'volume'])
+
+        oscillators = rng.standard_normal((100, 3)) * [100, 100, 50]
+        cls.mock_indicators = {
+            'rsi': pd.Series(rng.uniform(30, 70, 100)),
+            'macd': pd.Series(oscillators[:, 0]),
+            'signal': pd.Series(oscillators[:, 1]),
+            'histogram': pd.Series(oscillators[:, 2])
+        }
+
     def setUp(self):
-        """Set up test fixtures"""
+        """Set up per-test fixtures; the timeframe manager caches fetched data"""
         self.config = ConfigManager()
         self.tv_adapter = TradingViewAdapter(self.config)
         self.tf_manager = TimeframeManager(self.config, self.tv_adapter)
 
-        # Create mock data
-        self.mock_ohlcv = pd.DataFrame({
-            'open': np.random.normal(45000, 1000, 100),
-            'high': np.random.normal(46000, 1000, 100),
-            'low': np.random.normal(44000, 1000, 100),
-            'close': np.random.normal(45000, 1000, 100),
-            'volume': np.random.normal(100000, 20000, 100)
-        })
-
-        self.mock_indicators = {
-            'rsi': pd.Series(np.random.uniform(30, 70, 100)),
-            'macd': pd.Series(np.random.normal(0, 100, 100)),
-            'signal': pd.Series(np.random.normal(0, 100, 100)),
-            'histogram': pd.Series(np.random.normal(0, 50, 100))
-        }
-
     @patch('src.indicators.timeframe_manager.TimeframeManager.get_timeframe_data')
     def test_bottom_indicator_calculation(self, mock_get_data):
         """Test bottom indicator calculation"""
@@ -75,10 +75,11 @@ class TestIndicators(unittest.TestCase):
 
         # Add Bollinger Bands to mock data
         mock_indicators_with_bb = self.mock_indicators.copy()
+        bands = np.random.default_rng(7).uniform([46000, 43000, 1000], [47000, 44000, 3000], (100, 3))
         mock_indicators_with_bb.update({
-            'upper': pd.Series(np.random.uniform(46000, 47000, 100)),
-            'lower': pd.Series(np.random.uniform(43000, 44000, 100)),
-            'width': pd.Series(np.random.uniform(1000, 3000, 100))
+            'upper': pd.Series(bands[:, 0]),
+            'lower': pd.Series(bands[:, 1]),
+            'width': pd.Series(bands[:, 2])
         })
 
         mock_get_data.return_value['indicators'] = mock_indicators_with_bb
@@ -94,6 +95,20 @@ class TestIndicators(unittest.TestCase):
             self.assertGreaterEqual(normalized_score, 0)
             self.assertLessEqual(normalized_score, 1)
 
+    def test_timed_top_time_weight(self):
+        """Test time weighting against an injected clock"""
+        from datetime import datetime
+        from src.indicators.top.timed_top_score import TimedTopScoreIndicator
+
+        def weight_at(hour, minute):
+            clock = lambda: datetime(2025, 1, 1, hour, minute)
+            return TimedTopScoreIndicator(self.config, self.tf_manager, clock=clock).calculate_time_weight()
+
+        self.assertEqual(weight_at(8, 0), 1.0)
+        self.assertEqual(weight_at(14, 0), 0.7)
+        # Distance wraps around midnight: 01:00 is 300 minutes after 20:00
+        self.assertAlmostEqual(weight_at(1, 0), 1.0 - (300 / 360) * 0.3)
+
     def test_config_manager(self):
         """Test configuration manager"""
         # Test data sources config
@@ -149,6 +164,39 @@ class TestIndicators(unittest.TestCase):
         cache_status = self.tf_manager.get_cache_status()
         self.assertIsInstance(cache_status, dict)
 
+    def test_timeframe_manager_disk_cache(self):
+        """Test that timeframe data survives a restart via the disk cache"""
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            tf_manager = TimeframeManager(self.config, self.tv_adapter, cache_dir=cache_dir)
+            data = tf_manager.get_daily_data()
+            self.assertIsNotNone(data)
+
+            with patch.object(self.tv_adapter, 'get_timeframe_data') as mock_get_tf_data:
+                restarted = TimeframeManager(self.config, self.tv_adapter, cache_dir=cache_dir)
+                cached = restarted.get_daily_data()
+                mock_get_tf_data.assert_not_called()
+
+            pd.testing.assert_frame_equal(cached['ohlcv'], data['ohlcv'], check_freq=False, check_index_type=False)
+            self.assertEqual(cached['last_close'], data['last_close'])
+
+    def test_timeframe_manager_disk_cache_ignores_pickles(self):
+        """Test that the disk cache never unpickles files and defaults to the project root"""
+        import tempfile
+        from src.indicators.timeframe_manager import DEFAULT_CACHE_DIR
+
+        self.assertEqual(DEFAULT_CACHE_DIR, Path(__file__).resolve().parent.parent / '.cache' / 'tf')
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            pd.DataFrame({'close': [1.0]}).to_pickle(Path(cache_dir) / 'D.pkl')
+            (Path(cache_dir) / 'D.json').write_text('{"last_update": "2099-01-01T00:00:00"}')
+
+            with patch('pandas.read_pickle') as mock_read_pickle:
+                tf_manager = TimeframeManager(self.config, self.tv_adapter, cache_dir=cache_dir)
+                mock_read_pickle.assert_not_called()
+            self.assertFalse(tf_manager.get_cache_status()['D']['cached'])
+
 class TestDataAdapters(unittest.TestCase):
     def setUp(self):
         self.config = ConfigManager()
@@ -170,9 +218,75 @@ class TestDataAdapters(unittest.TestCase):
         self.assertIn('signal', macd_data)
         self.assertIn('histogram', macd_data)
 
+    def test_real_market_adapter_batch(self):
+        """Test that the batch derives D/3D/5D from one daily fetch, matching the per-timeframe path"""
+        from src.data_adapters.real_market_adapter import RealMarketAdapter
+
+        adapter = RealMarketAdapter(self.config)
+        dates = pd.date_range('2020-01-01', periods=400, freq='D')
+        daily = pd.DataFrame({
+            'open': np.linspace(100, 200, 400),
+            'high': np.linspace(101, 201, 400),
+            'low': np.linspace(99, 199, 400),
+            'close': np.linspace(100.5, 200.5, 400),
+            'volume': np.ones(400)
+        }, index=dates)
+
+        def fetch(timeframe, bars):
+            return daily.tail(bars) if timeframe == 'D' else None
+
+        with patch.object(adapter, '_fetch_alpha_vantage_history', side_effect=fetch) as mock_fetch:
+            batch = adapter.get_timeframes_batch(['5D', '3D', 'D'], bars=50)
+            self.assertEqual(mock_fetch.call_count, 1)
+
+            for tf in ('5D', '3D', 'D'):
+                pd.testing.assert_frame_equal(batch[tf]['ohlcv'], adapter.get_btc_historical_data(tf, 50))
+
+        # 3D bars are bucketed on epoch-aligned boundaries, like TimeframeManager._bar_index
+        three_day = batch['3D']['ohlcv']
+        self.assertEqual(len(three_day), 50)
+        self.assertTrue(all((ts - pd.Timestamp(0)).days % 3 == 0 for ts in three_day.index))
+        self.assertEqual(three_day['volume'].iloc[-2], 3)
+        self.assertEqual(three_day['high'].iloc[-2], daily['high'].loc[:three_day.index[-1]].iloc[-2])
+
+    def test_real_market_adapter_multi_day_bars(self):
+        """Test the exact epoch-aligned 3D/5D bars and that a full refresh makes three upstream calls"""
+        from src.data_adapters.real_market_adapter import RealMarketAdapter
+
+        adapter = RealMarketAdapter(self.config)
+        close = np.arange(1.0, 11.0)
+        daily = pd.DataFrame({
+            'open': close - 0.5, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': close * 10
+        }, index=pd.date_range('2020-01-01', periods=10, freq='D'))
+        native = {'W': daily.iloc[:2], 'M': daily.iloc[:1]}
+
+        def fetch(timeframe, bars):
+            return daily.tail(bars) if timeframe == 'D' else native[timeframe]
+
+        with patch.object(adapter, '_fetch_alpha_vantage_history', side_effect=fetch) as mock_fetch:
+            batch = adapter.get_timeframes_batch(['M', 'W', '5D', '3D', 'D'], bars=10)
+            self.assertEqual(sorted(call.args[0] for call in mock_fetch.call_args_list), ['D', 'M', 'W'])
+
+        # Bins start on multiples of 3 or 5 days since the epoch, not on the first fetched day
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        expected_3d = pd.DataFrame(
+            [[0.5, 3, 0, 2, 30], [2.5, 6, 2, 5, 120], [5.5, 9, 5, 8, 210], [8.5, 11, 8, 10, 190]],
+            columns=columns, dtype=float,
+            index=pd.to_datetime(['2019-12-31', '2020-01-03', '2020-01-06', '2020-01-09'])
+        )
+        expected_5d = pd.DataFrame(
+            [[0.5, 4, 0, 3, 60], [3.5, 9, 3, 8, 300], [8.5, 11, 8, 10, 190]],
+            columns=columns, dtype=float,
+            index=pd.to_datetime(['2019-12-30', '2020-01-04', '2020-01-09'])
+        )
+        pd.testing.assert_frame_equal(batch['3D']['ohlcv'], expected_3d, check_freq=False, check_names=False)
+        pd.testing.assert_frame_equal(batch['5D']['ohlcv'], expected_5d, check_freq=False, check_names=False)
+        pd.testing.assert_frame_equal(batch['D']['ohlcv'], daily)
+
     @patch('requests.Session.get')
     def test_bitcoin_magazine_scraper(self, mock_get):
         """Test Bitcoin Magazine scraper"""
+        import tempfile
         from src.data_adapters.bitcoin_magazine_scraper import BitcoinMagazineScraper
 
         # Mock HTML response
@@ -181,12 +295,272 @@ class TestDataAdapters(unittest.TestCase):
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
-        scraper = BitcoinMagazineScraper(self.config)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            scraper = BitcoinMagazineScraper(self.config, cache_dir=cache_dir)
+
+            # Note: This will likely return None in testing due to mock limitations
+            # but tests that the method doesn't crash
+            result = scraper.get_cvdd()
+            self.assertIsInstance(result, (float, type(None)))
+
+            # Scraped values are served from the TTL cache on the next call
+            if result is not None:
+                calls = mock_get.call_count
+                self.assertEqual(scraper.get_cvdd(), result)
+                self.assertEqual(mock_get.call_count, calls)
+
+    def test_value_cache_shared_file(self):
+        """Test that caches pointing at the same file keep each other's entries"""
+        import os
+        import tempfile
+        from src.data_adapters._value_cache import ValueCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = ValueCache(cache_dir, 60, 'test')
+            second = ValueCache(cache_dir, 60, 'test')
+            first.put('a', 1.0)
+            second.put('b', 2.0)
+
+            self.assertEqual(first.get('a'), 1.0)
+            self.assertEqual(first.get('b'), 2.0)
+            self.assertEqual(os.listdir(cache_dir), ['values.json'])
+
+    def test_scraper_requests_are_serialized(self):
+        """Test that concurrent scrapers never have two rate-limited requests in flight"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from src.data_adapters.bitcoin_magazine_scraper import BitcoinMagazineScraper
 
-        # Note: This will likely return None in testing due to mock limitations
-        # but tests that the method doesn't crash
-        result = scraper.get_cvdd()
-        self.assertIsInstance(result, (float, type(None)))
+        state = {'active': 0, 'peak': 0}
+        state_lock = threading.Lock()
+
+        def fake_get(url, timeout):
+            with state_lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            # time.sleep is patched out below, so hold the request open with an event wait instead
+            threading.Event().wait(0.02)
+            with state_lock:
+                state['active'] -= 1
+            response = Mock()
+            response.content = b'<html></html>'
+            return response
+
+        scrapers = [BitcoinMagazineScraper(self.config, cache_dir=None) for _ in range(4)]
+        with patch('src.data_adapters.bitcoin_magazine_scraper.time.sleep'), \
+                patch('requests.Session.get', side_effect=fake_get):
+            with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+                list(executor.map(lambda scraper: scraper._make_request('https://example.com'), scrapers))
+
+        self.assertEqual(state['peak'], 1)
+
+class TestNumericKernels(unittest.TestCase):
+    def test_ewm_mean_matches_pandas(self):
+        """Test lfilter EWM against pandas ewm(span).mean()"""
+        from src.indicators._kernels import ewm_mean
+
+        values = np.random.default_rng(0).uniform(20, 80, 200)
+        for span in (8, 9, 13):
+            expected = pd.Series(values).ewm(span=span).mean().to_numpy()
+            np.testing.assert_allclose(ewm_mean(values, span), expected, rtol=1e-12)
+
+    def test_wavetrend_tci_matches_pandas(self):
+        """Test both WaveTrend kernels against the chained pandas EWMs"""
+        from src.indicators._kernels import _wavetrend_tci_loop, _wavetrend_tci_filtered
+
+        prices = pd.Series(np.cumsum(np.random.default_rng(0).normal(0, 100, 300)) + 45000)
+        esa = prices.ewm(span=10).mean()
+        d_ema = (prices - esa).abs().ewm(span=10).mean()
+        ci = ((prices - esa) / (0.015 * d_ema)).replace([np.inf, -np.inf], np.nan).fillna(0)
+        expected = ci.ewm(span=21).mean().to_numpy()
+
+        for kernel in (_wavetrend_tci_loop, _wavetrend_tci_filtered):
+            np.testing.assert_allclose(kernel(prices.to_numpy(), 10, 21), expected, rtol=1e-9, atol=1e-9)
+
+    def test_rsi_snapshot_matches_pandas(self):
+        """Test fused RSI snapshot against the pandas oscillator definitions"""
+        from src.indicators._kernels import _rsi_snapshot
+
+        rsi = pd.Series(np.random.default_rng(0).uniform(20, 80, 126))
+        stoch, ema9, tdi = _rsi_snapshot(rsi.to_numpy(), 14)
+
+        recent = rsi.tail(14)
+        self.assertAlmostEqual(stoch, (rsi.iloc[-1] - recent.min()) / (recent.max() - recent.min()))
+        self.assertAlmostEqual(ema9, rsi.ewm(span=9).mean().iloc[-1])
+        self.assertAlmostEqual(tdi, rsi.ewm(span=13).mean().ewm(span=8).mean().iloc[-1])
+
+    def test_linear_slope_matches_polyfit(self):
+        """Test closed-form slope against np.polyfit"""
+        from src.indicators._kernels import slope1
+
+        for n in (2, 6, 10):
+            values = np.random.default_rng(0).uniform(40000, 50000, n)
+            self.assertAlmostEqual(slope1(values), np.polyfit(range(n), values, 1)[0], places=6)
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self._tmp.name) / "test.db")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_migrates_baseline_schema(self):
+        """Test that a database with TEXT timestamps and non-cascading results is migrated in place"""
+        import json
+        import sqlite3
+        from datetime import datetime
+        from src.storage.database import IndicatorDatabase, SCHEMA_VERSION, TABLE_SCHEMAS, _epoch_us
+
+        started = datetime.now().replace(microsecond=0)
+        with sqlite3.connect(self.db_path) as conn:
+            for name, schema in TABLE_SCHEMAS.items():
+                baseline = schema.replace('timestamp INTEGER', 'timestamp TEXT').replace(' ON DELETE CASCADE', '')
+                conn.execute(baseline.format(name=name))
+            conn.execute(
+                "INSERT INTO calculations (timestamp, calculation_type, composite_score, raw_data) VALUES (?, ?, ?, ?)",
+                (started.isoformat(), 'bottom', 0.5, json.dumps({'composite_score': float('nan')}))
+            )
+            conn.execute(
+                "INSERT INTO indicator_results (calculation_id, indicator_name, indicator_type, timestamp) VALUES (1, 'rsi', 'bottom', ?)",
+                (started.isoformat(),)
+            )
+        conn.close()
+
+        database = IndicatorDatabase(self.db_path)
+        try:
+            conn = database._conn
+            self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+            for name in TABLE_SCHEMAS:
+                types = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({name})")}
+                self.assertEqual(types['timestamp'], 'INTEGER')
+            self.assertEqual(conn.execute("SELECT timestamp FROM calculations").fetchone()[0], _epoch_us(started))
+            self.assertEqual(conn.execute("PRAGMA foreign_key_list(indicator_results)").fetchone()[6], 'CASCADE')
+
+            calculations = database.get_recent_calculations()
+            self.assertEqual(len(calculations), 1)
+            self.assertEqual(calculations[0]['timestamp'], started.isoformat())
+            self.assertTrue(np.isnan(calculations[0]['raw_data']['composite_score']))
+        finally:
+            database.close()
+
+    def test_store_and_read_back(self):
+        """Test that a stored calculation reads back through the recent and history queries"""
+        from datetime import datetime
+        from src.storage.database import IndicatorDatabase
+
+        started = datetime.now().replace(microsecond=0)
+        results = {
+            'calculation_info': {'start_time': started, 'duration_seconds': 1.5},
+            'bottom_analysis': {
+                'composite_score': 0.4,
+                'data_quality': {'success_rate': 1.0},
+                'individual_indicators': {
+                    'rsi': {'type': 'bottom', 'raw_value': 28.0, 'normalized_score': 0.8, 'weight': 0.5,
+                            'bounds': {'lower': 20, 'upper': 80}, 'timestamp': started}
+                }
+            },
+            'top_analysis': {'composite_score': 0.1, 'data_quality': {'success_rate': 0.5}}
+        }
+
+        database = IndicatorDatabase(self.db_path)
+        try:
+            bottom_id = database.store_calculation(results)
+            self.assertIsNotNone(bottom_id)
+
+            calculations = database.get_recent_calculations(calc_type='bottom')
+            self.assertEqual(len(calculations), 1)
+            self.assertEqual(calculations[0]['id'], bottom_id)
+            self.assertEqual(calculations[0]['timestamp'], started.isoformat())
+            self.assertEqual(calculations[0]['raw_data']['composite_score'], 0.4)
+            self.assertEqual(len(database.get_recent_calculations()), 2)
+
+            history = database.get_indicator_history('rsi')
+            self.assertEqual(len(history), 1)
+            self.assertEqual(history[0]['calculation_id'], bottom_id)
+            self.assertEqual(history[0]['raw_value'], 28.0)
+            self.assertEqual(history[0]['bounds_upper'], 80)
+            self.assertEqual(history[0]['timestamp'], started.isoformat())
+        finally:
+            database.close()
+
+    def test_cleanup_cascades_to_indicator_results(self):
+        """Test that deleting old calculations also deletes their indicator results"""
+        from datetime import datetime, timedelta
+        from src.storage.database import IndicatorDatabase
+
+        def results_at(start_time):
+            return {
+                'calculation_info': {'start_time': start_time},
+                'bottom_analysis': {'individual_indicators': {'rsi': {'type': 'bottom', 'timestamp': start_time}}}
+            }
+
+        database = IndicatorDatabase(self.db_path)
+        try:
+            database.store_calculation(results_at(datetime.now() - timedelta(days=120)))
+            recent_id = database.store_calculation(results_at(datetime.now()))
+
+            database.cleanup_old_data(days=90)
+
+            conn = database._conn
+            self.assertEqual([row[0] for row in conn.execute("SELECT id FROM calculations")], [recent_id])
+            self.assertEqual([row[0] for row in conn.execute("SELECT calculation_id FROM indicator_results")], [recent_id])
+        finally:
+            database.close()
+
+    def test_close_flushes_queued_logs(self):
+        """Test that close() writes every queued system event before returning"""
+        import json
+        import sqlite3
+        from src.storage.database import IndicatorDatabase
+
+        database = IndicatorDatabase(self.db_path)
+        for i in range(1000):
+            database.log_system_event('INFO', 'test', f'event {i}', {'index': i})
+        database.close()
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT message, details FROM system_logs ORDER BY id").fetchall()
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual(rows[-1][0], 'event 999')
+        self.assertEqual(json.loads(rows[-1][1]), {'index': 999})
+
+    def test_unreferenced_database_is_released(self):
+        """Test that a dropped database stops its log writer and closes without an explicit close()"""
+        import gc
+        import sqlite3
+        import weakref
+        from src.storage.database import IndicatorDatabase
+
+        database = IndicatorDatabase(self.db_path)
+        database.log_system_event('INFO', 'test', 'queued before release')
+        writer = database._log_writer
+        ref = weakref.ref(database)
+
+        del database
+        gc.collect()
+
+        self.assertIsNone(ref())
+        self.assertFalse(writer.is_alive())
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM system_logs").fetchone()[0], 1)
+
+    def test_logs_queued_before_exit_are_written(self):
+        """Test that system events logged right before interpreter exit reach the database"""
+        import sqlite3
+        import subprocess
+
+        script = (
+            "from src.storage.database import IndicatorDatabase\n"
+            f"database = IndicatorDatabase({self.db_path!r})\n"
+            "for i in range(500):\n"
+            "    database.log_system_event('INFO', 'test', f'event {i}')\n"
+        )
+        subprocess.run([sys.executable, '-c', script], cwd=Path(__file__).parent.parent, check=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM system_logs").fetchone()[0], 500)
 
 class TestComposers(unittest.TestCase):
     def setUp(self):
@@ -244,5 +618,193 @@ class TestComposers(unittest.TestCase):
             self.assertIn('description', interp)
             self.assertIn('score', interp)
 
+class TestFileLogger(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from src.storage.file_logger import FileLogger
+        self._tmp = tempfile.TemporaryDirectory()
+        self.file_logger = FileLogger(self._tmp.name)
+        self.results = {
+            'bottom_analysis': {
+                'composite_score': 0.62,
+                'interpretation': {'strength': 'Strong'},
+                'data_quality': {'success_rate': 0.75},
+                'individual_indicators': {
+                    'rsi': {'normalized_score': 0.8},
+                    'mvrv': {'normalized_score': None}
+                }
+            },
+            'top_analysis': {
+                'composite_score': 0.21,
+                'interpretation': {'strength': 'Weak'},
+                'data_quality': {'success_rate': 1.0},
+                'individual_indicators': {'bbwp': {'normalized_score': 0.3}}
+            }
+        }
+
+    def tearDown(self):
+        self.file_logger.close()
+        self._tmp.cleanup()
+
+    @unittest.skipUnless(importlib.util.find_spec('msgpack'), "msgpack is not installed")
+    def test_historical_msgpack_round_trip(self):
+        """Test that appended MessagePack records read back in order with their scores"""
+        from datetime import datetime
+
+        self.file_logger.append_to_historical_msgpack(self.results)
+        self.results['bottom_analysis']['composite_score'] = 0.64
+        self.file_logger.append_to_historical_msgpack(self.results)
+        self.file_logger.close()
+
+        records = list(self.file_logger.read_historical_msgpack('bottom'))
+        self.assertEqual([record['composite_score'] for record in records], [0.62, 0.64])
+        self.assertEqual(records[0]['signal_strength'], 'Strong')
+        self.assertEqual(records[0]['success_rate'], 0.75)
+        self.assertEqual(records[0]['scores'], {'rsi': 0.8, 'mvrv': None})
+        self.assertIsInstance(records[0]['timestamp'], datetime)
+        self.assertEqual(len(list(self.file_logger.read_historical_msgpack('top'))), 2)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow is not installed")
+    def test_historical_parquet_reload(self):
+        """Test that buffered Parquet rows are flushed on close and reload with the fixed schema"""
+        import pyarrow.parquet as pq
+        from src.storage.file_logger import HISTORICAL_PARQUET_SCHEMA
+
+        self.file_logger.append_to_historical_parquet(self.results)
+        self.results['bottom_analysis']['composite_score'] = 0.64
+        self.file_logger.append_to_historical_parquet(self.results)
+        self.file_logger.close()
+
+        table = pq.read_table(Path(self._tmp.name) / 'csv' / 'historical_bottom_parquet')
+        self.assertTrue(table.schema.equals(HISTORICAL_PARQUET_SCHEMA))
+        rows = table.to_pylist()
+        self.assertEqual([row['composite_score'] for row in rows], [0.62, 0.64])
+        self.assertEqual(rows[0]['signal_strength'], 'Strong')
+        self.assertEqual(rows[0]['scores'], [('rsi', 0.8), ('mvrv', None)])
+        self.assertIsNotNone(rows[0]['timestamp'].tzinfo)
+
+        top = pq.read_table(Path(self._tmp.name) / 'csv' / 'historical_top_parquet')
+        self.assertEqual(top.num_rows, 2)
+
+    def test_csv_matches_csv_writer_output(self):
+        """Test that the pandas-written CSVs are byte-identical to csv.DictWriter/csv.writer output"""
+        import csv
+        from datetime import datetime
+        from src.storage.file_logger import SUMMARY_CSV_SCHEMA, _summary_rows
+
+        started = datetime(2025, 1, 2, 3, 4, 5, 678901)
+        indicators = {
+            'rsi': {'type': 'bottom', 'raw_value': np.float64(28.123456789), 'normalized_score': np.float64(1 / 3),
+                    'weight': 0.1, 'bounds': {'lower': 20, 'upper': np.float64(80.5)}, 'timestamp': started},
+            'mvrv': {'type': 'bottom', 'raw_value': float('nan'), 'normalized_score': None,
+                     'weight': 0.2, 'bounds': {'lower': np.nan, 'upper': None}, 'timestamp': started},
+            'puell': {'type': 'bottom', 'raw_value': None, 'normalized_score': np.float64('nan'), 'weight': np.float64(0.3)}
+        }
+        results = {
+            'calculation_info': {'start_time': started, 'duration_seconds': np.float64(1.25)},
+            'market_context': {'current_btc_price': float('nan')},
+            'bottom_analysis': {'composite_score': np.float64(0.62), 'interpretation': {'strength': None},
+                                'data_quality': {'success_rate': 75.0}}
+        }
+
+        csv_dir = Path(self._tmp.name) / 'csv'
+        self.file_logger._write_indicators_csv(indicators, csv_dir / 'indicators.csv')
+        self.file_logger._write_summary_csv(results, csv_dir / 'summary.csv')
+
+        # Reference output from the csv-module writers these methods replaced
+        fieldnames = ['indicator_name', 'indicator_type', 'raw_value', 'normalized_score',
+                      'weight', 'bounds_lower', 'bounds_upper', 'timestamp', 'success']
+        with open(csv_dir / 'expected_indicators.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for name, data in indicators.items():
+                bounds = data.get('bounds', {})
+                writer.writerow({
+                    'indicator_name': name, 'indicator_type': data.get('type'),
+                    'raw_value': data.get('raw_value'), 'normalized_score': data.get('normalized_score'),
+                    'weight': data.get('weight'), 'bounds_lower': bounds.get('lower'),
+                    'bounds_upper': bounds.get('upper'), 'timestamp': data.get('timestamp'),
+                    'success': data.get('normalized_score') is not None
+                })
+        with open(csv_dir / 'expected_summary.csv', 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Metric', 'Value'])
+            writer.writerows(_summary_rows(results, SUMMARY_CSV_SCHEMA))
+
+        for name in ('indicators', 'summary'):
+            self.assertEqual((csv_dir / f'{name}.csv').read_bytes(), (csv_dir / f'expected_{name}.csv').read_bytes())
+
+    def test_historical_csv_appends_under_existing_header(self):
+        """Test that appends to a historical CSV with a different header keep its columns"""
+        import csv
+
+        csv_path = Path(self._tmp.name) / 'csv' / 'historical_bottom.csv'
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'composite_score', 'signal_strength', 'success_rate', 'rsi_score', 'retired_score'])
+            writer.writerow(['2025-01-01T00:00:00', 0.5, 'Moderate', 50.0, 0.4, 0.9])
+
+        with self.assertLogs('src.storage.file_logger', level='WARNING') as logs:
+            self.file_logger.append_to_historical_csv({'bottom_analysis': self.results['bottom_analysis']})
+        self.assertEqual(len([line for line in logs.output if 'mvrv' in line]), 1)
+
+        # The missing column is reported once per file, not on every append
+        with self.assertNoLogs('src.storage.file_logger', level='WARNING'):
+            self.file_logger.append_to_historical_csv({'bottom_analysis': self.results['bottom_analysis']})
+        self.file_logger.close()
+
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['timestamp', 'composite_score', 'signal_strength', 'success_rate', 'rsi_score', 'retired_score'])
+        self.assertEqual(len(rows), 4)
+        for row in rows[2:]:
+            self.assertEqual(row[1:], ['0.62', 'Strong', '0.75', '0.8', ''])
+
+    def _assert_json_round_trip(self):
+        """Log results holding NaN, numpy scalars and datetimes, then check the parsed file"""
+        import json
+        from datetime import datetime
+
+        started = datetime(2025, 1, 2, 3, 4, 5)
+        results = {
+            'calculation_info': {'start_time': started, 'duration_seconds': np.float64(1.5)},
+            'bottom_analysis': {
+                'composite_score': float('nan'),
+                'individual_indicators': {
+                    'rsi': {'raw_value': np.float64('nan'), 'normalized_score': np.float64(0.25), 'history': [1.0, float('nan')]},
+                    'mvrv': {'raw_value': np.int64(3), 'normalized_score': None}
+                }
+            }
+        }
+
+        filepath = self.file_logger.log_calculation_json(results, 'results.json')
+        self.assertIsNotNone(filepath)
+        with open(filepath, encoding='utf-8') as f:
+            text = f.read()
+        self.assertNotIn('NaN', text)
+
+        self.assertEqual(json.loads(text), {
+            'calculation_info': {'start_time': started.isoformat(), 'duration_seconds': 1.5},
+            'bottom_analysis': {
+                'composite_score': None,
+                'individual_indicators': {
+                    'rsi': {'raw_value': None, 'normalized_score': 0.25, 'history': [1.0, None]},
+                    'mvrv': {'raw_value': 3, 'normalized_score': None}
+                }
+            }
+        })
+        # The input tree is left untouched
+        self.assertTrue(np.isnan(results['bottom_analysis']['composite_score']))
+
+    @unittest.skipUnless(importlib.util.find_spec('orjson'), "orjson is not installed")
+    def test_json_round_trip_orjson(self):
+        """Test the orjson path writes NaN as null and converts numpy scalars and datetimes"""
+        self._assert_json_round_trip()
+
+    def test_json_round_trip_stdlib(self):
+        """Test the stdlib json fallback writes NaN as null and converts numpy scalars and datetimes"""
+        with patch('src.storage.file_logger.orjson', None):
+            self._assert_json_round_trip()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file